@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import CustomUser, Resume
+from .models import (
+    CustomUser, ExtractedText, JobRole, Resume, ResumeExtractionJob, Skill, SkillSynonym,
+)
 
 
 
@@ -13,3 +15,31 @@ class CustomUserAdmin(admin.ModelAdmin):
 class ResumeAdmin(admin.ModelAdmin):
     list_display = ('user', 'file', 'uploaded_at', 'ats_score')
     list_filter = ('uploaded_at',)
+
+@admin.register(ExtractedText)
+class ExtractedTextAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'extractor_version', 'pages', 'hit_count', 'parse_seconds', 'created_at')
+    list_filter = ('extractor_version',)
+    search_fields = ('sha256',)
+
+@admin.register(ResumeExtractionJob)
+class ResumeExtractionJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'resume', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status',)
+
+class SkillSynonymInline(admin.TabularInline):
+    model = SkillSynonym
+    extra = 1
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'ats')
+    list_filter = ('ats',)
+    search_fields = ('name', 'synonyms__name')
+    inlines = [SkillSynonymInline]
+
+@admin.register(JobRole)
+class JobRoleAdmin(admin.ModelAdmin):
+    list_display = ('name', 'analysis')
+    list_filter = ('analysis',)
+    filter_horizontal = ('skills',)
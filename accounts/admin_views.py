@@ -1,45 +1,196 @@
+import json
+from datetime import datetime, time
+
 from django.contrib.auth import get_user_model
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from .authentication import CachedUserJWTAuthentication
 from .permissions import IsAdmin
-from django.utils.timezone import now
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Exists, OuterRef, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, localtime, make_aware, now
 from .models import Resume
+from . import metrics, search, text_cache
+from career_backend.db import read_replica
 
 User = get_user_model()
 
+USER_FIELDS = ('id', 'username', 'email', 'role', 'date_joined')
+USERS_PAGE_SIZE = 100
+USERS_MAX_PAGE_SIZE = 1000
+
+# is_staff is checked against the user row: a token's claim can be up to an
+# access token lifetime old
+ADMIN_AUTHENTICATION = [CachedUserJWTAuthentication]
+
+
+def _parse_when(value):
+    # accepts a date or a full ISO datetime
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.min)
+    if is_naive(parsed):
+        parsed = make_aware(parsed)
+    return parsed
+
+
+def _stream_users(users):
+    for row in users.iterator(chunk_size=2000):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
 @api_view(['GET'])
+@authentication_classes(ADMIN_AUTHENTICATION)
 @permission_classes([IsAuthenticated, IsAdmin])
+@read_replica
 def admin_users(request):
+    params = request.query_params
+
+    try:
+        cursor = int(params.get('cursor', 0))
+        limit = min(max(int(params.get('limit', USERS_PAGE_SIZE)), 1), USERS_MAX_PAGE_SIZE)
+        joined_after = _parse_when(params.get('joined_after'))
+        joined_before = _parse_when(params.get('joined_before'))
+    except ValueError:
+        return Response(
+            {"error": "cursor and limit must be numbers, joined_after/joined_before ISO dates"},
+            status=400
+        )
+
+    users = User.objects.filter(pk__gt=cursor).order_by('pk')
+
+    role = params.get('role')
+    if role:
+        users = users.filter(role=role.upper())
+    if joined_after:
+        users = users.filter(date_joined__gte=joined_after)
+    if joined_before:
+        users = users.filter(date_joined__lt=joined_before)
+
+    users = users.values(*USER_FIELDS)
+
+    # ?stream=ndjson: every matching user, one JSON object per line
+    if params.get('stream') == 'ndjson':
+        return StreamingHttpResponse(_stream_users(users), content_type='application/x-ndjson')
+
+    page = list(users[:limit])
+    next_cursor = page[-1]['id'] if len(page) == limit else None
+
+    return Response({
+        "results": page,
+        "next_cursor": next_cursor,
+    })
+
+ANALYTICS_CACHE_KEY = "admin:analytics"
+
+
+def _analytics_snapshot():
+    start_of_day = localtime().replace(hour=0, minute=0, second=0, microsecond=0)
 
-    users = User.objects.all().values(
-        'id','username','email','role'
+    users = User.objects.aggregate(
+        total_users=Count('id'),
+        admins=Count('id', filter=Q(is_staff=True)),
+        users_without_resumes=Count(
+            'id', filter=~Exists(Resume.objects.filter(user=OuterRef('pk')))
+        ),
     )
+    resumes = Resume.objects.aggregate(
+        total_resumes=Count('id'),
+        uploads_today=Count('id', filter=Q(uploaded_at__gte=start_of_day)),
+    )
+
+    return {
+        "total_users": users['total_users'],
+        "total_resumes": resumes['total_resumes'],
+        "admins": users['admins'],
+        "uploads_today": resumes['uploads_today'],
+        "users_without_resumes": users['users_without_resumes'],
+        "generated_at": now().isoformat(),
+    }
 
-    return Response(users)
 
 @api_view(['GET'])
+@authentication_classes(ADMIN_AUTHENTICATION)
 @permission_classes([IsAuthenticated, IsAdmin])
+@read_replica
 def admin_analytics(request):
 
-    total_users = User.objects.count()
-    total_resumes = Resume.objects.count()
-    admin_count = User.objects.filter(is_staff=True).count()
+    data = cache.get(ANALYTICS_CACHE_KEY)
 
-    uploads_today = Resume.objects.filter(
-        uploaded_at__date=now().date()
-    ).count()
+    if data is None:
+        data = _analytics_snapshot()
+        cache.set(
+            ANALYTICS_CACHE_KEY, data, getattr(settings, 'ADMIN_ANALYTICS_CACHE_TTL', 60)
+        )
 
-    users_without_resumes = User.objects.filter(
-        resumes__isnull=True
-    ).count()
+    return Response(data)
 
-    data = {
-        "total_users": total_users,
-        "total_resumes": total_resumes,
-        "admins": admin_count,
-        "uploads_today": uploads_today,
-        "users_without_resumes": users_without_resumes
-    }
+@api_view(['GET'])
+@authentication_classes(ADMIN_AUTHENTICATION)
+@permission_classes([IsAuthenticated, IsAdmin])
+@read_replica
+def admin_extraction_cache(request):
+    return Response(text_cache.stats())
 
-    return Response(data)
+@api_view(['POST'])
+@authentication_classes(ADMIN_AUTHENTICATION)
+@permission_classes([IsAuthenticated, IsAdmin])
+@read_replica
+def admin_candidate_search(request):
+    job_description = request.data.get('job_description', '')
+    if not job_description:
+        return Response({"error": "Job description is required"}, status=400)
+
+    try:
+        limit = min(max(int(request.data.get('limit', 20)), 1), 100)
+    except (TypeError, ValueError):
+        return Response({"error": "limit must be a number"}, status=400)
+
+    total, ranked = search.rank(job_description, limit)
+
+    resumes = Resume.objects.filter(
+        pk__in=[resume_id for resume_id, _, _ in ranked]
+    ).select_related('user').only(
+        'id', 'uploaded_at', 'user__id', 'user__username', 'user__email'
+    ).in_bulk()
+
+    results = []
+    for resume_id, score, matched_terms in ranked:
+        resume = resumes.get(resume_id)
+        if resume is None:
+            # deleted since it was ranked
+            continue
+        results.append({
+            "rank": len(results) + 1,
+            "resume_id": resume_id,
+            "user_id": resume.user.id,
+            "username": resume.user.username,
+            "email": resume.user.email,
+            "uploaded_at": resume.uploaded_at,
+            "score": round(score, 4),
+            "matched_terms": matched_terms,
+        })
+
+    return Response({
+        "candidates_searched": total,
+        "results": results,
+    })
+
+
+# ---------- METRICS ----------
+@api_view(['GET'])
+@authentication_classes(ADMIN_AUTHENTICATION)
+@permission_classes([IsAuthenticated, IsAdmin])
+def admin_metrics(request):
+    # Prometheus text format; this process's numbers only
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
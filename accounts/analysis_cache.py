@@ -0,0 +1,113 @@
+"""
+Two-tier cache for analysis endpoint payloads.
+
+Entries are keyed by (endpoint, resume id and version, ruleset version[,
+variant]). A small per-process LRU sits in front of Django's cache
+framework, so repeat reads in the same worker skip the cache backend too.
+Bumping ``scoring.RULESET_VERSION`` changes every key, and re-extracting a
+resume changes its keys, which invalidates old entries lazily: they are
+never read again and age out of both tiers.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics, taxonomy
+from .scoring import RULESET_VERSION
+
+
+class LRUCache:
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local = LRUCache(getattr(settings, 'ANALYSIS_CACHE_LRU_SIZE', 1024))
+
+
+def cache_key(endpoint, resume, variant=''):
+    key = (
+        f"analysis:v{RULESET_VERSION}.{taxonomy.current().version}:{endpoint}:"
+        f"{resume.id}.{resume.version}"
+    )
+    return f"{key}:{variant}" if variant else key
+
+
+def get_or_compute(endpoint, resume, compute, variant=''):
+    """
+    Return the cached payload, or call ``compute()`` and cache its result.
+
+    ``compute`` returns None when there is nothing to analyze yet; that is
+    passed through and not cached.
+    """
+    key = cache_key(endpoint, resume, variant)
+
+    data = _local.get(key)
+    if data is not None:
+        metrics.analysis_cache.inc(endpoint, 'local')
+        return data
+
+    data = cache.get(key)
+    if data is None:
+        metrics.analysis_cache.inc(endpoint, 'miss')
+        started = time.perf_counter()
+        data = compute()
+        metrics.analysis_seconds.observe(time.perf_counter() - started, endpoint)
+        if data is None:
+            return None
+        cache.set(key, data, getattr(settings, 'ANALYSIS_CACHE_TIMEOUT', 24 * 60 * 60))
+
+    else:
+        metrics.analysis_cache.inc(endpoint, 'shared')
+
+    _local.set(key, data)
+    return data
+
+
+async def aget_or_compute(endpoint, resume, compute, variant=''):
+    """``get_or_compute`` for async views; ``compute`` is a coroutine function."""
+    key = cache_key(endpoint, resume, variant)
+
+    data = _local.get(key)
+    if data is not None:
+        metrics.analysis_cache.inc(endpoint, 'local')
+        return data
+
+    data = await cache.aget(key)
+    if data is None:
+        metrics.analysis_cache.inc(endpoint, 'miss')
+        started = time.perf_counter()
+        data = await compute()
+        metrics.analysis_seconds.observe(time.perf_counter() - started, endpoint)
+        if data is None:
+            return None
+        await cache.aset(key, data, getattr(settings, 'ANALYSIS_CACHE_TIMEOUT', 24 * 60 * 60))
+    else:
+        metrics.analysis_cache.inc(endpoint, 'shared')
+
+    _local.set(key, data)
+    return data
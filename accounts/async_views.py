@@ -0,0 +1,247 @@
+"""
+Async versions of the analysis and upload endpoints, for ASGI deployments.
+
+DRF views are synchronous, so these are plain Django async views that do
+the JWT check themselves and answer with the same payloads. Database reads
+use the async ORM; anything that still has to run synchronously (backfilling
+features, parsing a job description, storing an upload) is handed to a
+thread so the event loop keeps serving other requests meanwhile. Text
+extraction itself stays with ``run_extraction_workers``.
+"""
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from career_backend.db import read_replica
+
+from . import analysis_cache, etags, jd, scoring, taxonomy
+from .authentication import StatelessJWTAuthentication
+from .features import get_features
+from .models import Resume, ResumeFeatures, current_resume_id
+from .serializers import ResumeSerializer
+from .upload_handlers import ResumeUploadHandler, UploadRejected
+from .uploads import store_upload
+
+
+def jwt_required(view):
+    """Authenticate like the DRF views do, answering 401 otherwise."""
+    authentication = StatelessJWTAuthentication()
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            result = await sync_to_async(authentication.authenticate)(request)
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+            return JsonResponse(detail, status=exc.status_code)
+
+        if result is None:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        request.user = result[0]
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+async def _current_resume(user, *fields):
+    fields = ('id', 'user', 'extracted', 'version') + fields
+    # a taxonomy check that's due queries: run it here, off the event loop,
+    # before the cache keys and ETags read the version
+    await taxonomy.acurrent()
+
+    resume = await Resume.objects.only(*fields).filter(pk=current_resume_id(user.id)).afirst()
+    if resume:
+        return resume
+
+    return await Resume.objects.filter(user_id=user.id).only(*fields).order_by('-uploaded_at', '-pk').afirst()
+
+
+async def _features(resume):
+    if not resume.extracted_id:
+        return None
+
+    features = await ResumeFeatures.objects.filter(resume_id=resume.pk).afirst()
+    if features is None or features.vocabulary_version != taxonomy.current().version:
+        # missing or matched against an older taxonomy: recompute like get_features
+        features = await sync_to_async(get_features)(resume)
+    return features
+
+
+async def _analyze(resume, score, *args):
+    features = await _features(resume)
+    if not features or not features.word_count:
+        return None
+    return score(features, *args)
+
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return request.POST
+
+
+# ---------- ANALYZE RESUME ----------
+@require_GET
+@jwt_required
+@read_replica
+async def analyze_resume(request):
+    resume = await _current_resume(request.user, 'ats_score')
+
+    if not resume:
+        return JsonResponse({"error": "No resume uploaded"}, status=404)
+
+    etag = etags.analysis_etag(resume)
+    unchanged = etags.not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+
+    data = await analysis_cache.aget_or_compute(
+        'ats', resume, lambda: _analyze(resume, scoring.ats_analysis)
+    )
+
+    if data is None:
+        return JsonResponse({"error": "Resume text not extracted"}, status=400)
+
+    if resume.ats_score != data["ATS_score"]:
+        await Resume.objects.filter(pk=resume.pk).aupdate(ats_score=data["ATS_score"])
+
+    return etags.add_etag(JsonResponse(data), etag)
+
+
+# ---------- JOB MATCHER ----------
+@require_GET
+@jwt_required
+@read_replica
+async def job_matcher(request):
+    resume = await _current_resume(request.user)
+
+    data = None
+    if resume:
+        etag = etags.analysis_etag(resume)
+        unchanged = etags.not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        data = await analysis_cache.aget_or_compute(
+            'job_matcher', resume, lambda: _analyze(resume, scoring.job_matches)
+        )
+
+    if data is None:
+        return JsonResponse({"error": "Resume not ready"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return etags.add_etag(JsonResponse(data), etag)
+
+
+# ---------- SKILL GAP ----------
+@require_GET
+@jwt_required
+@read_replica
+async def skill_gap_analyzer(request):
+    resume = await _current_resume(request.user)
+
+    data = None
+    if resume:
+        etag = etags.analysis_etag(resume)
+        unchanged = etags.not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        data = await analysis_cache.aget_or_compute(
+            'skill_gap', resume, lambda: _analyze(resume, scoring.skill_gap)
+        )
+
+    if data is None:
+        return JsonResponse({"error": "Resume not ready"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return etags.add_etag(JsonResponse(data), etag)
+
+
+# ---------- JOB DESCRIPTION ----------
+@csrf_exempt
+@require_POST
+@jwt_required
+@read_replica
+async def job_description_matcher(request):
+    payload = _request_data(request)
+    if payload is None:
+        return JsonResponse({"error": "Invalid request body"}, status=status.HTTP_400_BAD_REQUEST)
+
+    resume = await _current_resume(request.user)
+    job_description = payload.get('job_description', '')
+    mode = payload.get('mode', 'weighted')
+
+    if mode not in ('weighted', 'basic'):
+        return JsonResponse(
+            {"error": "mode must be 'weighted' or 'basic'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    data = None
+    if resume and job_description:
+        digest = jd.content_hash(job_description)
+
+        async def compute():
+            if mode == 'weighted':
+                job_terms = await sync_to_async(jd.parse)(job_description, digest)
+                return await _analyze(resume, scoring.weighted_job_description_match, job_terms)
+            return await _analyze(resume, scoring.job_description_match, job_description)
+
+        data = await analysis_cache.aget_or_compute(
+            'job_description', resume, compute, variant=f"{mode}:{digest}"
+        )
+
+    if data is not None:
+        return JsonResponse(data)
+
+    features = await _features(resume) if resume else None
+    if not features or not features.word_count:
+        return JsonResponse(
+            {"error": "Resume not ready or not uploaded"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return JsonResponse(
+        {"error": "Job description is required"},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+# ---------- UPLOAD RESUME ----------
+def _upload(request):
+    request.upload_handlers = [ResumeUploadHandler(request)]
+    try:
+        serializer = ResumeSerializer(data=request.FILES)
+    except UploadRejected as exc:
+        return {"error": str(exc.detail)}, exc.status_code
+
+    try:
+        if serializer.is_valid():
+            return store_upload(serializer, request.user)
+        return serializer.errors, status.HTTP_400_BAD_REQUEST
+    finally:
+        # this thread isn't the request's, so its connection isn't closed for us
+        close_old_connections()
+
+
+@csrf_exempt
+@require_POST
+@jwt_required
+async def upload_resume(request):
+    # parsing, hashing and storing the file all block, so they run in a
+    # worker thread of their own rather than on the event loop
+    data, status_code = await sync_to_async(_upload, thread_sensitive=False)(request)
+    return JsonResponse(data, status=status_code)
@@ -0,0 +1,93 @@
+"""
+JWT authentication without a user query per request.
+
+Tokens issued by ``ClaimsRefreshToken`` carry the user's ``role`` and
+``is_staff``, so ``StatelessJWTAuthentication``, the default, answers with a
+``ClaimsUser`` built from the token alone. The claims are re-read from the
+database whenever the refresh token is used, so a role change reaches
+clients within one access token lifetime.
+
+Views that need the ``CustomUser`` itself, or fresher claims than that (the
+admin endpoints), use ``CachedUserJWTAuthentication`` instead: the user row,
+kept in process for ``AUTH_USER_CACHE_TTL`` seconds.
+"""
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .analysis_cache import LRUCache
+
+ROLE_CLAIM = 'role'
+STAFF_CLAIM = 'is_staff'
+
+_users = LRUCache(getattr(settings, 'AUTH_USER_CACHE_SIZE', 1024))
+
+
+def add_claims(token, user):
+    token[ROLE_CLAIM] = user.role
+    token[STAFF_CLAIM] = user.is_staff
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+
+    @classmethod
+    def for_user(cls, user):
+        return add_claims(super().for_user(user), user)
+
+
+class ClaimsUser(TokenUser):
+    """
+    The authenticated user as the access token describes it. Views that
+    need the model instance should look it up by ``id``.
+    """
+
+    @property
+    def id(self):
+        # simplejwt stores the id as a string
+        return get_user_model()._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_staff(self):
+        return self.token[STAFF_CLAIM]
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """
+    simplejwt's authentication with the user looked up at most once per
+    ``AUTH_USER_CACHE_TTL`` seconds. Every request gets its own copy of the
+    cached instance, so changes made to it stay in that request.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        entry = _users.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return copy.copy(entry[1])
+
+        user = super().get_user(validated_token)
+        ttl = getattr(settings, 'AUTH_USER_CACHE_TTL', 30)
+        if ttl:
+            _users.set(user_id, (time.monotonic() + ttl, copy.copy(user)))
+        return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        claims = (api_settings.USER_ID_CLAIM, ROLE_CLAIM, STAFF_CLAIM)
+        if not all(claim in validated_token for claim in claims):
+            # issued before the claims were added; refreshing adds them
+            raise InvalidToken("Token has no role claims")
+        return ClaimsUser(validated_token)
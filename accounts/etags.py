@@ -0,0 +1,31 @@
+"""
+Conditional GETs for the analysis endpoints.
+
+An analysis payload is a function of the resume's text (``Resume.version``),
+the scoring rules (``scoring.RULESET_VERSION``) and the skills taxonomy, so
+the ETag is built from those and checked right after the resume row is read, before any
+features are loaded or scored. Clients revalidate every time; an unchanged
+result costs that one lookup and an empty 304.
+"""
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from . import taxonomy
+from .scoring import RULESET_VERSION
+
+
+def analysis_etag(resume):
+    return f'"{resume.id}.{resume.version}.{RULESET_VERSION}.{taxonomy.current().version}"'
+
+
+def add_etag(response, etag):
+    response['ETag'] = etag
+    # per user, and never reused without asking
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def not_modified(request, etag):
+    """A 304 if the client already holds ``etag``, otherwise None."""
+    response = get_conditional_response(request, etag=etag)
+    return add_etag(response, etag) if response is not None else None
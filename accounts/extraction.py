@@ -0,0 +1,177 @@
+"""
+Resume text extraction engine.
+
+Nothing in here touches Django, so the functions can run inside pool
+worker processes. ``accounts.utils`` reads the settings and calls in.
+"""
+import os
+import signal
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing.util import Finalize
+
+import docx
+import pdfplumber
+
+# PDFs shorter than this are parsed in-process; below it the pool
+# round-trip costs more than the pages do.
+PARALLEL_MIN_PAGES = 8
+
+# Bump whenever a change here alters the text produced for the same file;
+# cached ExtractedText rows are keyed on it.
+EXTRACTOR_VERSION = 1
+
+ExtractionResult = namedtuple(
+    'ExtractionResult',
+    ['text', 'pages', 'timed_out_pages', 'seconds'],
+    defaults=[0.0],
+)
+
+
+class PageTimeout(Exception):
+    pass
+
+
+class _Deadline:
+    expired = False
+
+
+@contextmanager
+def _page_deadline(seconds):
+    # SIGALRM can only be armed from the main thread; pool workers run tasks
+    # there, request threads don't, so those just skip the per-page limit.
+    deadline = _Deadline()
+    if (
+        not seconds
+        or not hasattr(signal, 'setitimer')
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield deadline
+        return
+
+    def _expired(signum, frame):
+        deadline.expired = True
+        raise PageTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield deadline
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_pages(pdf, start, stop, page_timeout):
+    parts = []
+    timed_out = 0
+
+    for number in range(start, stop):
+        page = pdf.pages[number]
+        try:
+            with _page_deadline(page_timeout) as deadline:
+                parts.append(page.extract_text() or "")
+        except Exception:
+            # pdfplumber re-raises errors from inside pdfminer wrapped in its
+            # own exception type, so check the flag rather than the class
+            if not deadline.expired:
+                raise
+            timed_out += 1
+        finally:
+            # drop the parsed layout objects so memory stays flat across pages
+            page.close()
+
+    return "\n".join(parts), timed_out
+
+
+def _extract_page_range(path, start, stop, page_timeout):
+    with pdfplumber.open(path) as pdf:
+        return _extract_pages(pdf, start, stop, page_timeout)
+
+
+_pool = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool, _pool_size
+
+    with _pool_lock:
+        if _pool is None or _pool_size != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_size = workers
+            # inside an extraction worker (itself a pool process) nothing else
+            # shuts this pool down, and exiting waits for its processes; it
+            # has to run before the pool's own queue finalizers (priority 10)
+            Finalize(_pool, _pool.shutdown, exitpriority=100)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+
+
+def _split(total, parts):
+    step, extra = divmod(total, parts)
+    start = 0
+    for index in range(parts):
+        stop = start + step + (1 if index < extra else 0)
+        if stop > start:
+            yield start, stop
+        start = stop
+
+
+def extract_pdf(source, max_pages=None, page_timeout=None, workers=1):
+    """
+    Extract text from a PDF given as a path or an open binary file.
+
+    Page ranges are spread over a process pool when ``workers`` > 1, the
+    source is a path and the document is long enough to be worth it.
+    ``max_pages`` caps how many leading pages are read and ``page_timeout``
+    (seconds) skips pages whose layout analysis runs too long.
+    """
+    with pdfplumber.open(source) as pdf:
+        total = len(pdf.pages)
+        if max_pages:
+            total = min(total, max_pages)
+
+        parallel = (
+            workers > 1
+            and total >= PARALLEL_MIN_PAGES
+            and isinstance(source, (str, os.PathLike))
+        )
+        if not parallel:
+            text, timed_out = _extract_pages(pdf, 0, total, page_timeout)
+            return ExtractionResult(text, total, timed_out)
+
+    pool = _get_pool(workers)
+    try:
+        futures = [
+            pool.submit(_extract_page_range, os.fspath(source), start, stop, page_timeout)
+            for start, stop in _split(total, workers)
+        ]
+        chunks = [future.result() for future in futures]
+    except BrokenProcessPool:
+        _reset_pool()
+        raise
+
+    text = "\n".join(chunk_text for chunk_text, _ in chunks)
+    timed_out = sum(chunk_timed_out for _, chunk_timed_out in chunks)
+    return ExtractionResult(text, total, timed_out)
+
+
+def extract_docx(source):
+    doc = docx.Document(source)
+    text = "\n".join(para.text for para in doc.paragraphs)
+    return ExtractionResult(text, 0, 0)
@@ -0,0 +1,77 @@
+import re
+
+from . import taxonomy
+from .keywords import SECTIONS
+from .models import ResumeFeatures
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"\b\d{10}\b")
+WORD_RE = re.compile(r"\w+")
+
+FEATURE_FIELDS = (
+    'tokens', 'keywords', 'skills', 'sections', 'has_email', 'has_phone', 'word_count',
+    'vocabulary_version',
+)
+
+
+def compute_features(text):
+    text = (text or "").lower()
+    vocabulary = taxonomy.current()
+    found = vocabulary.matcher.find(text)
+
+    return {
+        "tokens": sorted(set(WORD_RE.findall(text))),
+        "keywords": sorted(found),
+        "skills": [skill for skill in vocabulary.ats_skills if skill in found],
+        "sections": [sec for sec in SECTIONS if sec in found],
+        "has_email": bool(EMAIL_RE.search(text)),
+        "has_phone": bool(PHONE_RE.search(text)),
+        "word_count": len(text.split()),
+        "vocabulary_version": vocabulary.version,
+    }
+
+
+def refresh_features(resume, text=None):
+    if text is None:
+        text = resume.extracted_text
+
+    features, _ = ResumeFeatures.objects.update_or_create(
+        resume=resume, defaults=compute_features(text)
+    )
+    resume.features = features
+    return features
+
+
+def refresh_features_for_text(resume, row):
+    """
+    Fill in features after ``row`` (an ExtractedText) was attached to the
+    resume, reusing those of another resume with the same file if one exists.
+    """
+    source = ResumeFeatures.objects.filter(
+        resume__extracted=row, vocabulary_version=taxonomy.current().version
+    ).exclude(resume=resume).values(*FEATURE_FIELDS).first()
+
+    if source is None:
+        return refresh_features(resume, row.text)
+
+    features, _ = ResumeFeatures.objects.update_or_create(resume=resume, defaults=source)
+    resume.features = features
+    return features
+
+
+def get_features(resume):
+    """
+    Features for a resume, backfilling rows extracted before features existed
+    and recomputing those matched against an older taxonomy. Returns None
+    while the text is still being extracted.
+    """
+    try:
+        features = resume.features
+    except ResumeFeatures.DoesNotExist:
+        features = None
+
+    if features is not None and features.vocabulary_version == taxonomy.current().version:
+        return features
+    if not resume.extracted_id:
+        return features
+    return refresh_features(resume)
@@ -0,0 +1,93 @@
+"""
+Model fields.
+"""
+import zlib
+
+from django import forms
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+
+class CompressedText:
+    """
+    A compressed value as read from the database. Saving it again writes the
+    same bytes back without a decompress/compress round trip.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def decompress(self):
+        return zlib.decompress(self.data).decode('utf-8')
+
+    def __len__(self):
+        return len(self.data)
+
+
+class CompressedTextDescriptor(DeferredAttribute):
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, CompressedText):
+            # decompressed on first access, then kept on the instance
+            value = value.decompress()
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedTextField(models.Field):
+    """
+    Text stored zlib-compressed in a binary column.
+
+    Rows come back still compressed and are only decompressed when the
+    attribute is read, so queries that load the row but not the text pay
+    for neither. The column holds bytes, so text lookups (``__icontains``,
+    ``Length``) don't work on it.
+    """
+    descriptor_class = CompressedTextDescriptor
+
+    def __init__(self, *args, level=6, **kwargs):
+        self.level = level
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.level != 6:
+            kwargs['level'] = self.level
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return 'BinaryField'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return CompressedText(bytes(value))
+
+    def to_python(self, value):
+        if isinstance(value, CompressedText):
+            return value.decompress()
+        return value
+
+    def pre_save(self, model_instance, add):
+        # skip the descriptor: an untouched value is saved as-is
+        return model_instance.__dict__.get(self.attname)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+        if isinstance(value, CompressedText):
+            data = value.data
+        else:
+            data = zlib.compress(str(value).encode('utf-8'), self.level)
+        return connection.Database.Binary(data)
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{'widget': forms.Textarea, **kwargs})
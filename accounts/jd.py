@@ -0,0 +1,106 @@
+"""
+Job description parsing for job_description_matcher.
+
+A posting is tokenized, stripped of stopwords and weighted once, then
+cached by the SHA-256 of its text, so the same posting matched by many users
+is only parsed once. Term weights are BM25 query weights: IDF from the
+candidate search index times a saturating function of the term's frequency
+in the posting.
+"""
+import hashlib
+import math
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from . import metrics, taxonomy
+from .analysis_cache import LRUCache
+from .models import SearchDocument, SearchPosting
+from .search import index_terms
+
+WORD_RE = re.compile(r"\w+")
+
+# saturation for repeated terms in the posting (BM25's k3)
+K3 = 8.0
+
+_local = LRUCache(getattr(settings, 'JD_CACHE_LRU_SIZE', 256))
+
+
+def content_hash(job_description):
+    return hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+
+
+def _corpus_idf(words):
+    total = SearchDocument.objects.count()
+    if not total:
+        # nothing indexed yet: every term counts the same
+        return {word: 1.0 for word in words}
+
+    df = dict(
+        SearchPosting.objects.filter(term__in=words)
+        .values_list('term')
+        .annotate(n=Count('id'))
+    )
+    return {
+        word: math.log1p((total - df.get(word, 0) + 0.5) / (df.get(word, 0) + 0.5))
+        for word in words
+    }
+
+
+def _parse(job_description):
+    terms = index_terms(job_description)
+
+    # skills that aren't a single \w+ word ("ci/cd", "machine learning")
+    # are weighted as one phrase instead of as their parts
+    phrases = {}
+    for keyword in taxonomy.current().matcher.find(job_description):
+        if WORD_RE.fullmatch(keyword):
+            continue
+        parts = [part for part in WORD_RE.findall(keyword) if part in terms]
+        phrases[keyword] = parts or WORD_RE.findall(keyword)
+        for part in parts:
+            terms.pop(part, None)
+
+    idf = _corpus_idf(
+        set(terms) | {part for parts in phrases.values() for part in parts}
+    )
+
+    weighted = [
+        (term, idf[term] * (K3 + 1) * qtf / (K3 + qtf), False)
+        for term, qtf in terms.items()
+    ]
+    weighted += [
+        (phrase, max(idf.get(part, 1.0) for part in parts), True)
+        for phrase, parts in phrases.items()
+    ]
+    weighted.sort(key=lambda item: (-item[1], item[0]))
+    return weighted
+
+
+def parse(job_description, digest=None):
+    """
+    Return the posting's terms as (term, weight, is_phrase), heaviest first.
+    """
+    # phrases depend on the skills taxonomy
+    key = f"jd:{taxonomy.current().version}:{digest or content_hash(job_description)}"
+    timeout = getattr(settings, 'JD_CACHE_TIMEOUT', 10 * 60)
+
+    # the weights follow the corpus, so the local copy expires like the shared one
+    entry = _local.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        metrics.jd_cache.inc('local')
+        return entry[1]
+
+    parsed = cache.get(key)
+    if parsed is None:
+        metrics.jd_cache.inc('miss')
+        parsed = _parse(job_description)
+        cache.set(key, parsed, timeout)
+    else:
+        metrics.jd_cache.inc('shared')
+
+    _local.set(key, (time.monotonic() + timeout, parsed))
+    return parsed
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import now
+
+from . import metrics, text_cache
+from .models import ResumeExtractionJob
+
+
+def enqueue_extraction(resume):
+    return ResumeExtractionJob.objects.create(resume=resume)
+
+
+def enqueue_extractions(resumes):
+    return ResumeExtractionJob.objects.bulk_create(
+        [ResumeExtractionJob(resume=resume) for resume in resumes]
+    )
+
+
+def claim_jobs(limit):
+    """
+    Move up to ``limit`` pending jobs to RUNNING and return them.
+
+    The status check is part of the UPDATE, so several worker commands can
+    poll the same table without claiming a job twice.
+    """
+    pending = ResumeExtractionJob.objects.filter(
+        status=ResumeExtractionJob.PENDING
+    ).order_by('id').values_list('id', flat=True)[:limit]
+
+    claimed = []
+    for job_id in list(pending):
+        updated = ResumeExtractionJob.objects.filter(
+            pk=job_id, status=ResumeExtractionJob.PENDING
+        ).update(
+            status=ResumeExtractionJob.RUNNING,
+            started_at=now(),
+            attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(job_id)
+
+    return list(
+        ResumeExtractionJob.objects.filter(pk__in=claimed)
+        .select_related('resume')
+        .order_by('id')
+    )
+
+
+def requeue_stale_jobs(older_than):
+    # jobs left RUNNING by a worker that died mid-extraction
+    return ResumeExtractionJob.objects.filter(
+        status=ResumeExtractionJob.RUNNING,
+        started_at__lt=now() - timedelta(seconds=older_than),
+    ).update(status=ResumeExtractionJob.PENDING)
+
+
+def _finish(job, status, error=''):
+    """
+    Record the outcome; False if the job is gone because its resume was
+    deleted while it ran (the job rows cascade with it).
+    """
+    job.status = status
+    job.error = error
+    job.finished_at = now()
+    return bool(ResumeExtractionJob.objects.filter(pk=job.pk).update(
+        status=status, error=error, finished_at=job.finished_at
+    ))
+
+
+def complete_job(job, result=None, cached=None):
+    """
+    Finish a job with a fresh ``ExtractionResult`` or an already cached
+    ``ExtractedText`` row. Returns False, storing nothing, if the resume has
+    been deleted meanwhile.
+    """
+    with transaction.atomic():
+        # updating the job first also locks it against a concurrent delete
+        if not _finish(job, ResumeExtractionJob.DONE):
+            return False
+
+        resume = job.resume
+        if cached is None:
+            if not resume.content_hash:
+                with resume.file.open('rb') as fh:
+                    resume.content_hash = text_cache.hash_file(fh)
+                resume.save(update_fields=['content_hash'])
+            cached = text_cache.store(resume.content_hash, result)
+            metrics.record_extraction(resume.file.name, result, resume.file.size)
+
+        text_cache.attach_text(resume, cached)
+    return True
+
+
+def fail_job(job, error):
+    """Returns False if the job went with its deleted resume."""
+    metrics.extraction_failures.inc()
+    return _finish(job, ResumeExtractionJob.FAILED, str(error))
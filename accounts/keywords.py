@@ -0,0 +1,6 @@
+# Keyword lists used by the analysis endpoints. Skills and job roles live in
+# the database (accounts/taxonomy.py).
+
+SECTIONS = ["education", "experience", "skills", "projects"]
+
+ACTION_VERBS = ["developed", "built", "designed", "implemented", "created"]
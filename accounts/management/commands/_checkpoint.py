@@ -0,0 +1,56 @@
+import json
+import os
+
+
+class Checkpoint:
+    """
+    Progress of a long-running command, saved to a small JSON file so a
+    re-run continues after the last committed primary key.
+
+    The state is only reused when ``fingerprint`` matches, e.g. the ruleset
+    or extractor version the previous run was working towards. ``failed``
+    lists primary keys at or before ``last_pk`` that still need another try.
+    """
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.last_pk = 0
+        self.processed = 0
+        self.failed = []
+
+    def load(self):
+        try:
+            with open(self.path) as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            return False
+
+        if state.get('fingerprint') != self.fingerprint:
+            return False
+
+        self.last_pk = state.get('last_pk', 0)
+        self.processed = state.get('processed', 0)
+        self.failed = state.get('failed', [])
+        return True
+
+    def save(self, last_pk, processed, failed=()):
+        self.last_pk = last_pk
+        self.processed = processed
+        self.failed = sorted(failed)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as fh:
+            json.dump({
+                'fingerprint': self.fingerprint,
+                'last_pk': last_pk,
+                'processed': processed,
+                'failed': self.failed,
+            }, fh)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
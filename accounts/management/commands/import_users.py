@@ -0,0 +1,202 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from accounts.models import CustomUser
+from accounts.serializers import UserSerializer, existing_emails
+
+ROLES = {role for role, _ in CustomUser.ROLE_CHOICES}
+
+
+def _init_worker():
+    # no-op under fork; spawned workers need the app registry for the hasher
+    django.setup()
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8') as fh:
+        for number, row in enumerate(csv.DictReader(fh), start=2):
+            yield number, row
+
+
+def _read_jsonl(path):
+    with open(path, encoding='utf-8') as fh:
+        for number, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+
+
+class Command(BaseCommand):
+    help = "Create users in bulk from a CSV or JSONL file (username, email, password[, role])."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format',
+            choices=('csv', 'jsonl'),
+            help="Input format; guessed from the file extension by default.",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Password hashing processes.",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if fmt == 'json':
+            fmt = 'jsonl'
+        if fmt not in ('csv', 'jsonl'):
+            raise CommandError("Can't tell the format from the extension; pass --format")
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+
+        rows = _read_csv(path) if fmt == 'csv' else _read_jsonl(path)
+        batch_size = max(1, options['batch_size'])
+        workers = max(1, options['workers'])
+
+        created = skipped = 0
+        started = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+
+                valid, passwords = self._validate(batch)
+                skipped += len(batch) - len(valid)
+                if not valid:
+                    continue
+
+                # bcrypt dominates; chunks keep the pickling overhead small
+                chunksize = max(1, len(passwords) // (workers * 4))
+                hashes = pool.map(make_password, passwords, chunksize=chunksize)
+                for (_, user), hashed in zip(valid, hashes):
+                    user.password = hashed
+
+                inserted = self._insert(valid)
+                created += inserted
+                skipped += len(valid) - inserted
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{created} created, {skipped} skipped ({created / elapsed:.0f} users/s)"
+                )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {created} user(s) created, {skipped} skipped in {elapsed:.1f}s"
+        ))
+
+    def _validate(self, batch):
+        candidates = []
+        for number, row in batch:
+            if row is None:
+                self._skip(number, "not a JSON object")
+                continue
+
+            username = (row.get('username') or '').strip()
+            email = (row.get('email') or '').strip()
+            password = row.get('password') or ''
+            role = (row.get('role') or 'USER').strip().upper()
+
+            if not username:
+                self._skip(number, "username is required")
+                continue
+            if role not in ROLES:
+                self._skip(number, f"unknown role {role!r}")
+                continue
+            try:
+                UserSerializer().validate_password(password)
+            except serializers.ValidationError as exc:
+                self._skip(number, exc.detail[0])
+                continue
+
+            user = CustomUser(username=username, email=email, role=role)
+            try:
+                # uniqueness is checked below, for the whole batch at once
+                user.full_clean(
+                    exclude=['password'], validate_unique=False, validate_constraints=False
+                )
+            except ValidationError as exc:
+                self._skip(number, '; '.join(
+                    f"{field}: {' '.join(messages)}" for field, messages in exc.message_dict.items()
+                ))
+                continue
+
+            candidates.append((number, user, password))
+
+        # one IN query each for the batch, against the unique indexes
+        taken_emails = existing_emails([user.email for _, user, _ in candidates if user.email])
+        taken_usernames = set(
+            CustomUser.objects.filter(
+                username__in=[user.username for _, user, _ in candidates]
+            ).values_list('username', flat=True)
+        )
+
+        valid, passwords = [], []
+        for number, user, password in candidates:
+            if user.username in taken_usernames:
+                self._skip(number, f"username {user.username!r} is taken")
+                continue
+            if user.email and user.email.lower() in taken_emails:
+                self._skip(number, f"email {user.email!r} is already in use")
+                continue
+
+            # later rows in the same batch see earlier ones as taken
+            taken_usernames.add(user.username)
+            if user.email:
+                taken_emails.add(user.email.lower())
+
+            valid.append((number, user))
+            passwords.append(password)
+
+        return valid, passwords
+
+    def _insert(self, valid):
+        """
+        Insert the (line number, user) pairs and return how many made it.
+        A user created since the batch was checked makes the bulk insert
+        fail; the batch is then inserted row by row, skipping the clashes.
+        """
+        try:
+            with transaction.atomic():
+                CustomUser.objects.bulk_create([user for _, user in valid], batch_size=500)
+            return len(valid)
+        except IntegrityError:
+            pass
+
+        inserted = 0
+        for number, user in valid:
+            # ids the rolled back insert may have assigned
+            user.pk = None
+            try:
+                with transaction.atomic():
+                    CustomUser.objects.bulk_create([user])
+            except IntegrityError:
+                self._skip(number, "username or email is already in use")
+                continue
+            inserted += 1
+        return inserted
+
+    def _skip(self, number, reason):
+        self.stderr.write(f"line {number}: {reason}")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from accounts.models import Resume
+from accounts.search import index_resume
+
+
+class Command(BaseCommand):
+    help = "Index every user's latest extracted resume for candidate search."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        latest = Resume.objects.values('user').annotate(latest=Max('pk')).values('latest')
+        resumes = Resume.objects.filter(
+            pk__in=latest, extracted__isnull=False
+        ).select_related('extracted').order_by('pk')
+
+        indexed = 0
+        for resume in resumes.iterator(chunk_size=options['chunk_size']):
+            index_resume(resume, resume.extracted.text)
+            indexed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} resume(s)"))
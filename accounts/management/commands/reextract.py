@@ -0,0 +1,202 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from accounts import text_cache
+from accounts.extraction import EXTRACTOR_VERSION
+from accounts.features import refresh_features_for_text
+from accounts.models import ExtractedText, Resume
+from accounts.search import index_resume
+from accounts.utils import extract_resume_from_path
+
+from ._checkpoint import Checkpoint
+
+
+class Command(BaseCommand):
+    help = "Re-extract the text of resumes parsed by an older extractor version."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'EXTRACTION_WORKERS', None) or os.cpu_count() or 1,
+            help="Number of extraction processes.",
+        )
+        parser.add_argument('--chunk-size', type=int, default=200)
+        parser.add_argument(
+            '--max-rate',
+            type=float,
+            default=0,
+            help="Start at most this many extractions per second (0: no limit).",
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=str(settings.BASE_DIR / 'reextract.checkpoint.json'),
+            help="Progress file; an interrupted run continues from it.",
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help="Ignore any saved progress and start from the first resume.",
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help="Once done, delete older versions' text that no resume points at anymore.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        checkpoint = Checkpoint(options['checkpoint'], f"extractor-{EXTRACTOR_VERSION}")
+
+        if not options['restart'] and checkpoint.load():
+            self.stdout.write(
+                f"Resuming after resume {checkpoint.last_pk} "
+                f"({checkpoint.processed} already processed, "
+                f"{len(checkpoint.failed)} to retry)"
+            )
+
+        # still on an older version: what this run hasn't reached yet, and
+        # what failed before the checkpoint
+        retry = set(checkpoint.failed)
+        outdated = Resume.objects.filter(
+            Q(pk__gt=checkpoint.last_pk) | Q(pk__in=retry), extracted__isnull=False
+        ).exclude(
+            extracted__extractor_version=EXTRACTOR_VERSION
+        ).only('id', 'user', 'file', 'content_hash', 'version').order_by('pk')
+        rows = outdated.iterator(chunk_size=chunk_size)
+
+        last_pk = checkpoint.last_pk
+        processed = checkpoint.processed
+        self.pages = 0
+        self.failed = set()
+        self.interval = 1 / options['max_rate'] if options['max_rate'] > 0 else 0
+        self.next_start = 0.0
+        started = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                texts = self._extract(pool, chunk)
+                self._save(chunk, texts)
+
+                pks = {resume.pk for resume in chunk}
+                processed += len(pks - retry)
+                retry -= pks
+                last_pk = max(last_pk, chunk[-1].pk)
+                checkpoint.save(last_pk, processed, retry | self.failed)
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{processed} processed, {len(self.failed)} failed "
+                    f"({self.pages / elapsed:.1f} pages/s)"
+                )
+
+        # failures stay outdated, so the next run selects them again
+        checkpoint.clear()
+        elapsed = time.perf_counter() - started
+        rate = self.pages / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {processed} resume(s) processed, {len(self.failed)} failed, "
+            f"{self.pages} page(s) in {elapsed:.1f}s ({rate:.1f} pages/s)"
+        ))
+
+        if options['prune']:
+            deleted, _ = ExtractedText.objects.filter(resumes__isnull=True).exclude(
+                extractor_version=EXTRACTOR_VERSION
+            ).delete()
+            self.stdout.write(f"Pruned {deleted} outdated text row(s)")
+
+    def _throttle(self):
+        if not self.interval:
+            return
+        delay = self.next_start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.next_start = max(self.next_start, time.monotonic()) + self.interval
+
+    def _extract(self, pool, chunk):
+        """{content hash: ExtractionResult or cached ExtractedText} for the chunk."""
+        for resume in chunk:
+            if not resume.content_hash:
+                try:
+                    with resume.file.open('rb') as fh:
+                        resume.content_hash = text_cache.hash_file(fh)
+                except OSError as e:
+                    self.failed.add(resume.pk)
+                    self.stderr.write(f"{resume.file.name} failed: {e}")
+
+        # identical files, here or already re-extracted, are parsed once
+        texts = text_cache.lookup_many([resume.content_hash for resume in chunk])
+        paths = {}
+        for resume in chunk:
+            if resume.content_hash and resume.content_hash not in texts:
+                paths.setdefault(resume.content_hash, resume.file.path)
+
+        futures = {}
+        for content_hash, path in paths.items():
+            self._throttle()
+            futures[pool.submit(extract_resume_from_path, path)] = content_hash
+
+        for future in as_completed(futures):
+            content_hash = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                self.failed.update(
+                    resume.pk for resume in chunk if resume.content_hash == content_hash
+                )
+                self.stderr.write(f"{paths[content_hash]} failed: {e}")
+                continue
+            texts[content_hash] = result
+            self.pages += result.pages
+        return texts
+
+    def _save(self, chunk, texts):
+        parsed = [
+            ExtractedText(
+                sha256=content_hash,
+                extractor_version=EXTRACTOR_VERSION,
+                text=result.text,
+                length=len(result.text),
+                pages=result.pages,
+                parse_seconds=result.seconds,
+            )
+            for content_hash, result in texts.items()
+            if not isinstance(result, ExtractedText)
+        ]
+
+        with transaction.atomic():
+            # a concurrent upload may have stored the same file meanwhile
+            ExtractedText.objects.bulk_create(parsed, ignore_conflicts=True, batch_size=100)
+            rows = {
+                row.sha256: row
+                for row in ExtractedText.objects.filter(
+                    sha256__in=[row.sha256 for row in parsed], extractor_version=EXTRACTOR_VERSION
+                )
+            }
+            rows.update(
+                (content_hash, row) for content_hash, row in texts.items()
+                if isinstance(row, ExtractedText)
+            )
+
+            done = [resume for resume in chunk if resume.content_hash in rows]
+            for resume in done:
+                resume.extracted = rows[resume.content_hash]
+                resume.version = F('version') + 1
+            Resume.objects.bulk_update(
+                done, ['extracted', 'content_hash', 'version'], batch_size=500
+            )
+
+        for resume in done:
+            refresh_features_for_text(resume, resume.extracted)
+            index_resume(resume, resume.extracted.text)
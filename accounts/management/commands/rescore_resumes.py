@@ -0,0 +1,99 @@
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from accounts import taxonomy
+from accounts.features import refresh_features
+from accounts.models import Resume
+from accounts.scoring import RULESET_VERSION, ats_scores
+
+from ._checkpoint import Checkpoint
+
+
+class Command(BaseCommand):
+    help = "Recompute every stored ats_score with the current scoring rules."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument(
+            '--checkpoint',
+            default=str(settings.BASE_DIR / 'rescore_resumes.checkpoint.json'),
+            help="Progress file; an interrupted run continues from it.",
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help="Ignore any saved progress and start from the first resume.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        vocabulary = taxonomy.current().version
+        checkpoint = Checkpoint(
+            options['checkpoint'], f"ruleset-{RULESET_VERSION}.{vocabulary}"
+        )
+
+        if not options['restart'] and checkpoint.load():
+            self.stdout.write(
+                f"Resuming after resume {checkpoint.last_pk} "
+                f"({checkpoint.processed} already rescored)"
+            )
+
+        self._backfill_features(checkpoint.last_pk, chunk_size, vocabulary)
+
+        rows = Resume.objects.filter(
+            pk__gt=checkpoint.last_pk, features__isnull=False
+        ).order_by('pk').values_list(
+            'pk', 'ats_score', 'features__keywords', 'features__has_email',
+            'features__has_phone', 'features__word_count',
+        ).iterator(chunk_size=chunk_size)
+
+        processed = checkpoint.processed
+        this_run = updated = 0
+        started = time.perf_counter()
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            pks, current, keywords, has_email, has_phone, word_count = zip(*chunk)
+            scores = ats_scores(keywords, has_email, has_phone, word_count)
+
+            changed = [
+                Resume(pk=pk, ats_score=int(score))
+                for pk, old, score in zip(pks, current, scores)
+                if old != score
+            ]
+            Resume.objects.bulk_update(changed, ['ats_score'], batch_size=500)
+
+            processed += len(chunk)
+            this_run += len(chunk)
+            updated += len(changed)
+            checkpoint.save(pks[-1], processed)
+
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{processed} rescored, {updated} changed ({this_run / elapsed:.0f} resumes/s)"
+            )
+
+        checkpoint.clear()
+        elapsed = time.perf_counter() - started
+        rate = this_run / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {processed} resume(s) rescored, {updated} changed "
+            f"in {elapsed:.1f}s ({rate:.0f} resumes/s)"
+        ))
+
+    def _backfill_features(self, after_pk, chunk_size, vocabulary):
+        # resumes extracted before ResumeFeatures existed, or matched against
+        # an older skills taxonomy
+        missing = Resume.objects.filter(
+            Q(features__isnull=True) | ~Q(features__vocabulary_version=vocabulary),
+            pk__gt=after_pk, extracted__isnull=False,
+        ).select_related('extracted')
+        for resume in missing.iterator(chunk_size=chunk_size):
+            refresh_features(resume)
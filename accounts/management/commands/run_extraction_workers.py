@@ -0,0 +1,109 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts import metrics, text_cache
+from accounts.jobs import claim_jobs, complete_job, fail_job, requeue_stale_jobs
+from accounts.utils import extract_resume_from_path
+
+
+class Command(BaseCommand):
+    help = "Claim queued resume extraction jobs and run them in a local process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'EXTRACTION_WORKERS', None) or os.cpu_count() or 1,
+            help="Number of extraction processes.",
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help="Requeue RUNNING jobs that were started more than this many seconds ago.",
+        )
+        parser.add_argument(
+            '--metrics-port',
+            type=int,
+            help="Serve this process's extraction metrics in the Prometheus format on this port.",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Exit once the queue is drained instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        poll_interval = options['poll_interval']
+
+        if options['metrics_port']:
+            metrics.serve(options['metrics_port'])
+
+        requeued = requeue_stale_jobs(options['stale_after'])
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+        self.stdout.write(f"Starting {workers} extraction worker(s)")
+
+        in_flight = {}
+        processed = failed = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # keep every process busy with one job queued behind it
+                free_slots = workers * 2 - len(in_flight)
+                if free_slots > 0:
+                    for job in claim_jobs(free_slots):
+                        # an identical upload may have been parsed since this one was queued
+                        cached = text_cache.lookup(job.resume.content_hash)
+                        if cached is not None:
+                            if complete_job(job, cached=cached):
+                                processed += 1
+                            else:
+                                self._vanished(job)
+                            continue
+
+                        future = pool.submit(extract_resume_from_path, job.resume.file.path)
+                        in_flight[future] = job
+
+                if not in_flight:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        stored = complete_job(job, future.result())
+                    except Exception as e:
+                        if fail_job(job, e):
+                            failed += 1
+                            self.stderr.write(f"Job {job.pk} failed: {e}")
+                        else:
+                            self._vanished(job)
+                        continue
+                    if stored:
+                        processed += 1
+                    else:
+                        self._vanished(job)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {processed} job(s), {failed} failed"
+        ))
+
+    def _vanished(self, job):
+        self.stdout.write(f"Job {job.pk} dropped: its resume was deleted")
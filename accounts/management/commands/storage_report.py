@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from accounts.models import ExtractedText
+
+
+def _size(n):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if n < 1024 or unit == 'GiB':
+            return f"{n:.1f} {unit}" if unit != 'B' else f"{n} B"
+        n /= 1024
+
+
+class Command(BaseCommand):
+    help = "Report the database size and how much of it is extracted resume text."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vacuum',
+            action='store_true',
+            help="VACUUM first, so space freed by deletes or migrations is returned.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f"Unsupported database: {connection.vendor}")
+
+        if options['vacuum']:
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
+
+        database, free, table = self._sizes()
+        line = f"Database:            {_size(database)}"
+        if free:
+            line += f" ({_size(free)} free, reclaimed by --vacuum)"
+        self.stdout.write(line)
+        self.stdout.write(f"ExtractedText table: {_size(table)}")
+
+        rows, characters, stored = self._text_totals()
+        ratio = characters / stored if stored else 0
+        self.stdout.write(
+            f"Extracted text:      {rows} row(s), {characters} characters "
+            f"stored in {_size(stored)} ({ratio:.1f}x)"
+        )
+
+    def _text_totals(self):
+        # raw SQL so the report also runs before the compression migration,
+        # when ``text`` is still a plain text column without ``length``
+        table = connection.ops.quote_name(ExtractedText._meta.db_table)
+        if connection.vendor == 'postgresql':
+            stored = "OCTET_LENGTH(text)"
+        else:
+            stored = "LENGTH(CAST(text AS BLOB))"
+
+        with connection.cursor() as cursor:
+            columns = {
+                column.name
+                for column in connection.introspection.get_table_description(
+                    cursor, ExtractedText._meta.db_table
+                )
+            }
+            characters = "length" if "length" in columns else "LENGTH(text)"
+            cursor.execute(
+                f"SELECT COUNT(*), COALESCE(SUM({characters}), 0), "
+                f"COALESCE(SUM({stored}), 0) FROM {table}"
+            )
+            return cursor.fetchone()
+
+    def _sizes(self):
+        table = ExtractedText._meta.db_table
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    "SELECT pg_database_size(current_database()), pg_total_relation_size(%s)",
+                    [table],
+                )
+                database, table_size = cursor.fetchone()
+                return database, 0, table_size
+
+            cursor.execute("PRAGMA page_size")
+            page_size = cursor.fetchone()[0]
+            cursor.execute("PRAGMA page_count")
+            pages = cursor.fetchone()[0]
+            cursor.execute("PRAGMA freelist_count")
+            free = cursor.fetchone()[0]
+
+            # dbstat is an optional SQLite module; without it only the total is known
+            try:
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = %s", [table]
+                )
+                table_size = cursor.fetchone()[0] or 0
+            except Exception:
+                table_size = 0
+
+        return pages * page_size, free * page_size, table_size
@@ -0,0 +1,66 @@
+"""
+Whole-word keyword matching over resume text.
+
+Keywords are matched on token boundaries, so "java" does not match inside
+"javascript" and "sql" does not match inside "mysql". Lookup is a dict hit
+per token (plus n-gram probes for multi-word keywords), so the cost of a
+scan depends on the text length, not on how many keywords there are.
+"""
+import re
+
+# "ci/cd", "node.js", "c++" and "c#" stay single tokens; a trailing "." or
+# "/" (end of a sentence, a list separator) does not stick to the word.
+TOKEN_RE = re.compile(r"[\w+#]+(?:[./-][\w+#]+)*")
+_SEPARATOR_RE = re.compile(r"[./-]")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    ``synonyms`` maps other spellings to a keyword ("k8s" -> "kubernetes");
+    they are found as that keyword.
+    """
+
+    def __init__(self, keywords, synonyms=None):
+        self._phrases = {}
+        for keyword in keywords:
+            words = tuple(tokenize(keyword))
+            if words:
+                self._phrases[words] = keyword
+        for synonym, keyword in (synonyms or {}).items():
+            words = tuple(tokenize(synonym))
+            if words:
+                self._phrases.setdefault(words, keyword)
+
+        self._starts = {words[0] for words in self._phrases if len(words) > 1}
+        self._longest = max((len(words) for words in self._phrases), default=1)
+
+    def _lookup(self, token):
+        keyword = self._phrases.get((token,))
+        if keyword is not None:
+            yield keyword
+        # "node.js" also counts as "node", the way \bnode\b would see it
+        if _SEPARATOR_RE.search(token):
+            for part in _SEPARATOR_RE.split(token):
+                keyword = self._phrases.get((part,))
+                if keyword is not None:
+                    yield keyword
+
+    def find(self, text):
+        """Return the set of keywords that occur in ``text``, in one pass."""
+        tokens = tokenize(text)
+        found = set()
+
+        for index, token in enumerate(tokens):
+            found.update(self._lookup(token))
+
+            if token in self._starts:
+                for size in range(2, self._longest + 1):
+                    keyword = self._phrases.get(tuple(tokens[index:index + size]))
+                    if keyword is not None:
+                        found.add(keyword)
+
+        return frozenset(found)
@@ -0,0 +1,179 @@
+"""
+In-process metrics in the Prometheus text format.
+
+Counters and histograms are plain dicts of floats behind a lock, so
+recording costs a dict lookup and an addition. Every process keeps its own
+numbers: web workers expose theirs at /metrics, and
+``run_extraction_workers --metrics-port`` serves the extraction side.
+"""
+import threading
+from bisect import bisect_left
+
+# request latency, seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# whole-document extraction, seconds
+EXTRACTION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, _labels(self.labelnames, labels), value
+
+
+class Histogram:
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, *labels):
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                # per-bucket counts (last one is +Inf), then the sum
+                entry = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[slot] += 1
+            entry[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {labels: list(entry) for labels, entry in self._values.items()}
+
+        names = self.labelnames + ('le',)
+        for labels, entry in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), entry):
+                cumulative += count
+                le = bound if bound == '+Inf' else _number(bound)
+                yield f"{self.name}_bucket", _labels(names, labels + (le,)), cumulative
+            yield f"{self.name}_count", _labels(self.labelnames, labels), cumulative
+            yield f"{self.name}_sum", _labels(self.labelnames, labels), entry[-1]
+
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{labels} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# ---------- requests ----------
+request_seconds = Histogram(
+    'http_request_duration_seconds', "Request latency by endpoint.",
+    ('endpoint', 'method', 'status'),
+)
+db_queries = Counter(
+    'db_queries_total', "Database queries run while serving requests.", ('endpoint',)
+)
+db_seconds = Counter(
+    'db_query_seconds_total', "Time spent in database queries while serving requests.", ('endpoint',)
+)
+profiles = Counter(
+    'profiled_requests_total', "Requests sampled into cProfile dumps.", ('endpoint',)
+)
+
+# ---------- analysis ----------
+analysis_cache = Counter(
+    'analysis_cache_requests_total',
+    "Analysis payload lookups by tier that answered (local, shared or miss).",
+    ('endpoint', 'result'),
+)
+analysis_seconds = Histogram(
+    'analysis_compute_seconds', "Time to compute an analysis payload on a cache miss.", ('endpoint',)
+)
+jd_cache = Counter(
+    'job_description_cache_requests_total',
+    "Parsed job description lookups (local, shared or miss).", ('result',),
+)
+text_cache = Counter(
+    'extraction_cache_requests_total', "Text cache lookups for uploaded files (hit or miss).", ('result',)
+)
+
+# ---------- extraction ----------
+extraction_seconds = Histogram(
+    'extraction_duration_seconds', "Text extraction time per document.", ('format',),
+    buckets=EXTRACTION_BUCKETS,
+)
+extraction_pages = Counter('extraction_pages_total', "Pages extracted.", ('format',))
+extraction_bytes = Counter('extraction_bytes_total', "File bytes extracted.", ('format',))
+extraction_failures = Counter('extraction_failures_total', "Extraction jobs that failed.")
+
+
+def record_extraction(name, result, size):
+    fmt = name.rsplit('.', 1)[-1].lower() if '.' in name else 'unknown'
+    extraction_seconds.observe(result.seconds, fmt)
+    extraction_pages.inc(fmt, amount=result.pages)
+    extraction_bytes.inc(fmt, amount=size)
+
+
+def serve(port, host='0.0.0.0'):
+    """Serve ``render()`` on its own port from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            body = render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
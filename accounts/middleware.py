@@ -0,0 +1,99 @@
+import cProfile
+import os
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics
+
+
+class _QueryStats:
+    """``execute_wrapper`` that counts and times queries, on every alias."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def _endpoint(request):
+    match = getattr(request, 'resolver_match', None)
+    # the route pattern, not the path, so ids don't explode the label set
+    return match.route if match else 'unmatched'
+
+
+class MetricsMiddleware:
+    """
+    Per-endpoint latency and database use for /metrics, and optionally a
+    cProfile dump for a random sample of requests
+    (``METRICS_PROFILE_SAMPLE_RATE``, written to ``METRICS_PROFILE_DIR``).
+
+    Queries are only counted for synchronous views; async views run theirs
+    on other threads' connections.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'METRICS_PROFILE_SAMPLE_RATE', 0.0)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        profiler = None
+        if self.sample_rate and random.random() < self.sample_rate:
+            profiler = cProfile.Profile()
+
+        queries = _QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            # read_replica views query the replica alias
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(queries))
+            if profiler is None:
+                response = self.get_response(request)
+            else:
+                response = profiler.runcall(self.get_response, request)
+        elapsed = time.perf_counter() - started
+
+        endpoint = _endpoint(request)
+        metrics.request_seconds.observe(elapsed, endpoint, request.method, response.status_code)
+        metrics.db_queries.inc(endpoint, amount=queries.count)
+        metrics.db_seconds.inc(endpoint, amount=queries.seconds)
+        if profiler is not None:
+            self._dump(profiler, endpoint)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        metrics.request_seconds.observe(
+            time.perf_counter() - started, _endpoint(request), request.method, response.status_code
+        )
+        return response
+
+    def _dump(self, profiler, endpoint):
+        directory = settings.METRICS_PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        name = endpoint.strip('/').replace('/', '.').replace('<', '').replace('>', '') or 'root'
+        profiler.dump_stats(os.path.join(directory, f"{name}-{time.time_ns()}.prof"))
+        metrics.profiles.inc(endpoint)
@@ -0,0 +1,88 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:40
+
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Text extracted before the cache existed came from an unversioned extractor.
+LEGACY_EXTRACTOR_VERSION = 0
+
+
+def _file_hash(resume, fallback):
+    digest = hashlib.sha256()
+    try:
+        with resume.file.open('rb') as fh:
+            for chunk in fh.chunks():
+                digest.update(chunk)
+    except (OSError, ValueError):
+        # the stored file is gone; key the row on the text instead
+        return hashlib.sha256(fallback.encode('utf-8')).hexdigest()
+    return digest.hexdigest()
+
+
+def move_text_to_cache(apps, schema_editor):
+    Resume = apps.get_model('accounts', 'Resume')
+    ExtractedText = apps.get_model('accounts', 'ExtractedText')
+
+    resumes = Resume.objects.exclude(extracted_text__isnull=True).order_by('pk')
+    for resume in resumes.iterator(chunk_size=500):
+        content_hash = _file_hash(resume, resume.extracted_text)
+        row, _ = ExtractedText.objects.get_or_create(
+            sha256=content_hash,
+            extractor_version=LEGACY_EXTRACTOR_VERSION,
+            defaults={'text': resume.extracted_text},
+        )
+        resume.content_hash = content_hash
+        resume.extracted = row
+        resume.save(update_fields=['content_hash', 'extracted'])
+
+
+def restore_text_from_cache(apps, schema_editor):
+    Resume = apps.get_model('accounts', 'Resume')
+
+    resumes = Resume.objects.filter(extracted__isnull=False).select_related('extracted')
+    for resume in resumes.iterator(chunk_size=500):
+        resume.extracted_text = resume.extracted.text
+        resume.save(update_fields=['extracted_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_resumeextractionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractedText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64)),
+                ('extractor_version', models.PositiveIntegerField()),
+                ('text', models.TextField(blank=True)),
+                ('pages', models.PositiveIntegerField(default=0)),
+                ('parse_seconds', models.FloatField(default=0)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('sha256', 'extractor_version'), name='extractedtext_sha256_version_uniq')],
+            },
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extracted',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resumes', to='accounts.extractedtext'),
+        ),
+        migrations.RunPython(move_text_to_cache, restore_text_from_cache),
+        migrations.RemoveField(
+            model_name='resume',
+            name='extracted_text',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_extractedtext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeFeatures',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='features', serialize=False, to='accounts.resume')),
+                ('tokens', models.JSONField(default=list)),
+                ('keywords', models.JSONField(default=list)),
+                ('skills', models.JSONField(default=list)),
+                ('sections', models.JSONField(default=list)),
+                ('has_email', models.BooleanField(default=False)),
+                ('has_phone', models.BooleanField(default=False)),
+                ('word_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_resumefeatures'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='accounts.resume')),
+                ('length', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('tf', models.PositiveIntegerField()),
+                ('doc_length', models.PositiveIntegerField(default=0)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='accounts.searchdocument')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'document', 'tf', 'doc_length'], name='searchposting_covering_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['uploaded_at'], name='resume_uploaded_at_idx'),
+        ),
+    ]
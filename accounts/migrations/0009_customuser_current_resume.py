@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def set_current_resume(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    Resume = apps.get_model('accounts', 'Resume')
+
+    latest = Resume.objects.filter(user=models.OuterRef('pk')).order_by('-pk').values('pk')[:1]
+    CustomUser.objects.update(current_resume=models.Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_user_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='current_resume',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.resume'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['user', 'uploaded_at'], name='resume_user_uploaded_idx'),
+        ),
+        migrations.RunPython(set_current_resume, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:40
+
+import accounts.fields
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def _batches(queryset):
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:BATCH_SIZE])
+        if not rows:
+            return
+        yield rows
+        last_pk = rows[-1].pk
+
+
+def compress_text(apps, schema_editor):
+    ExtractedText = apps.get_model('accounts', 'ExtractedText')
+
+    for rows in _batches(ExtractedText.objects.only('pk', 'text')):
+        for row in rows:
+            row.compressed_text = row.text
+            row.length = len(row.text)
+        ExtractedText.objects.bulk_update(rows, ['compressed_text', 'length'])
+
+
+def decompress_text(apps, schema_editor):
+    ExtractedText = apps.get_model('accounts', 'ExtractedText')
+
+    for rows in _batches(ExtractedText.objects.only('pk', 'compressed_text')):
+        for row in rows:
+            row.text = row.compressed_text
+        ExtractedText.objects.bulk_update(rows, ['text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_customuser_current_resume'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='extractedtext',
+            name='length',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='extractedtext',
+            name='compressed_text',
+            field=accounts.fields.CompressedTextField(blank=True, default=''),
+        ),
+        migrations.RunPython(compress_text, decompress_text),
+        migrations.RemoveField(
+            model_name='extractedtext',
+            name='text',
+        ),
+        migrations.RenameField(
+            model_name='extractedtext',
+            old_name='compressed_text',
+            new_name='text',
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:05
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def check_duplicate_emails(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+
+    duplicates = list(
+        CustomUser.objects.exclude(email='')
+        .values(email_lower=django.db.models.functions.text.Lower('email'))
+        .annotate(n=models.Count('pk'))
+        .filter(n__gt=1)
+        .values_list('email_lower', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Users share an email address (ignoring case); merge or change them "
+            "before applying this migration: " + ", ".join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_compress_extracted_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='user_email_ci_uniq'),
+        ),
+    ]
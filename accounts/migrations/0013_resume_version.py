@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
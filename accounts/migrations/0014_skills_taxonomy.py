@@ -0,0 +1,120 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# the lists accounts/keywords.py used to hard-code
+ATS_SKILLS = [
+    "python", "django", "java", "spring",
+    "javascript", "react", "node",
+    "mongodb", "sql", "docker", "aws",
+]
+
+JOB_MATCH_ROLES = {
+    "Backend Developer": ["python", "django", "sql", "api"],
+    "Frontend Developer": ["javascript", "react", "html", "css"],
+    "Full Stack Developer": ["python", "django", "react", "sql"],
+    "Java Developer": ["java", "spring", "hibernate"],
+    "DevOps Engineer": ["docker", "aws", "kubernetes"],
+}
+
+SKILL_GAP_ROLES = {
+    "Backend Developer": ["python", "django", "sql", "docker", "aws"],
+    "Frontend Developer": ["javascript", "react", "html", "css"],
+    "Full Stack Developer": ["python", "django", "react", "sql", "docker"],
+    "Java Developer": ["java", "spring", "hibernate", "microservices"],
+    "DevOps Engineer": ["docker", "aws", "kubernetes", "ci/cd"],
+}
+
+SYNONYMS = {
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "reactjs": "react",
+    "nodejs": "node",
+    "mongo": "mongodb",
+    "springboot": "spring",
+    "cicd": "ci/cd",
+    "ci-cd": "ci/cd",
+}
+
+
+def seed_taxonomy(apps, schema_editor):
+    Skill = apps.get_model('accounts', 'Skill')
+    SkillSynonym = apps.get_model('accounts', 'SkillSynonym')
+    JobRole = apps.get_model('accounts', 'JobRole')
+    TaxonomyVersion = apps.get_model('accounts', 'TaxonomyVersion')
+
+    names = list(ATS_SKILLS)
+    for roles in (JOB_MATCH_ROLES, SKILL_GAP_ROLES):
+        for skills in roles.values():
+            names += [name for name in skills if name not in names]
+
+    # inserted in list order, which is the order they're reported in
+    skills = {}
+    for name in names:
+        skills[name] = Skill.objects.create(name=name, ats=name in ATS_SKILLS)
+
+    SkillSynonym.objects.bulk_create([
+        SkillSynonym(name=name, skill=skills[skill]) for name, skill in SYNONYMS.items()
+    ])
+
+    for analysis, roles in (('MATCHER', JOB_MATCH_ROLES), ('SKILL_GAP', SKILL_GAP_ROLES)):
+        for name, role_skills in roles.items():
+            role = JobRole.objects.create(name=name, analysis=analysis)
+            for skill in role_skills:
+                role.skills.add(skills[skill])
+
+    # existing features were matched without the synonyms: their version 0
+    # is stale, so they are recomputed as they are read
+    TaxonomyVersion.objects.create(version=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_resume_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('ats', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaxonomyVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resumefeatures',
+            name='vocabulary_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='SkillSynonym',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='synonyms', to='accounts.skill')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobRole',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('analysis', models.CharField(choices=[('MATCHER', 'Job matcher'), ('SKILL_GAP', 'Skill gap')], max_length=10)),
+                ('skills', models.ManyToManyField(related_name='roles', to='accounts.skill')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('name', 'analysis'), name='jobrole_name_analysis_uniq')],
+            },
+        ),
+        migrations.RunPython(seed_taxonomy, migrations.RunPython.noop),
+    ]
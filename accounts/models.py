@@ -4,6 +4,9 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.db.models.functions import Lower
+
+from .fields import CompressedTextField
 
 
 # -----------user model------------
@@ -15,17 +18,234 @@ class CustomUser(AbstractUser):
     )
 
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='USER')
+    # newest upload; the analysis endpoints read this instead of scanning resumes
+    current_resume = models.ForeignKey(
+        'Resume', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # keyset pagination in admin/users/, optionally filtered
+            models.Index(fields=['role', 'id'], name='user_role_id_idx'),
+            models.Index(fields=['date_joined'], name='user_date_joined_idx'),
+        ]
+        constraints = [
+            # also the index behind the signup / import_users duplicate checks
+            models.UniqueConstraint(
+                Lower('email'),
+                condition=~models.Q(email=''),
+                name='user_email_ci_uniq',
+            ),
+        ]
+
+# -----extracted text cache------
+class ExtractedText(models.Model):
+    # one row per distinct file (by SHA-256 of its bytes) and extractor version;
+    # every Resume with the same content points at the same row
+    sha256 = models.CharField(max_length=64)
+    extractor_version = models.PositiveIntegerField()
+    text = CompressedTextField(blank=True, default='')
+    # characters in ``text``; the column itself is compressed bytes
+    length = models.PositiveIntegerField(default=0)
+    pages = models.PositiveIntegerField(default=0)
+    parse_seconds = models.FloatField(default=0)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sha256', 'extractor_version'],
+                name='extractedtext_sha256_version_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} (v{self.extractor_version})"
 
 # -----resume model------
 class Resume(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='resumes')
     file = models.FileField(upload_to='resumes/')
-    extracted_text = models.TextField(blank=True, null=True) 
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    extracted = models.ForeignKey(
+        ExtractedText, on_delete=models.SET_NULL, null=True, blank=True, related_name='resumes'
+    )
     uploaded_at = models.DateTimeField(auto_now_add=True)
     ats_score = models.IntegerField(null=True, blank=True)
-    
+    # bumped whenever the text behind the analysis changes; part of its ETag
+    version = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['uploaded_at'], name='resume_uploaded_at_idx'),
+            models.Index(fields=['user', 'uploaded_at'], name='resume_user_uploaded_idx'),
+        ]
+
+    def make_current(self):
+        # uploads can commit out of order, so the pointer only moves forward
+        CustomUser.objects.filter(pk=self.user_id).filter(
+            models.Q(current_resume__isnull=True) | models.Q(current_resume__lt=self.pk)
+        ).update(current_resume=self)
+
+    @property
+    def extracted_text(self):
+        return self.extracted.text if self.extracted_id else None
+
+    @property
+    def extractor_version(self):
+        # outdated ones are refreshed by `manage.py reextract`
+        return self.extracted.extractor_version if self.extracted_id else None
 
     def __str__(self):
         return f"{self.user.username} - {self.file.name}"
 
+
+def current_resume_id(user_id):
+    """``user_id``'s current resume pointer, as a subquery."""
+    return models.Subquery(
+        CustomUser.objects.filter(pk=user_id).values('current_resume')[:1]
+    )
+
+
+# -----extraction job model------
+class ResumeExtractionJob(models.Model):
+
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='extraction_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='extractionjob_status_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.pk} ({self.status}) - resume {self.resume_id}"
+
+# -----resume features model------
+class ResumeFeatures(models.Model):
+    # everything the analysis endpoints need, derived once from the text
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, primary_key=True, related_name='features')
+    tokens = models.JSONField(default=list)
+    keywords = models.JSONField(default=list)
+    skills = models.JSONField(default=list)
+    sections = models.JSONField(default=list)
+    has_email = models.BooleanField(default=False)
+    has_phone = models.BooleanField(default=False)
+    word_count = models.PositiveIntegerField(default=0)
+    # the TaxonomyVersion the keywords were matched with
+    vocabulary_version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Features for resume {self.resume_id}"
+
+# -----candidate search index------
+class SearchDocument(models.Model):
+    # only each user's latest extracted resume is indexed
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    length = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Search document for resume {self.resume_id}"
+
+
+class SearchPosting(models.Model):
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name='postings')
+    term = models.CharField(max_length=64)
+    tf = models.PositiveIntegerField()
+    # copy of document.length; documents are replaced, never edited
+    doc_length = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # covers the whole ranking query, so it never touches the table
+            models.Index(fields=['term', 'document', 'tf', 'doc_length'], name='searchposting_covering_idx'),
+        ]
+
+# -----revoked refresh tokens------
+class RevokedToken(models.Model):
+    # see accounts/revocation.py; rows are purged once the token has expired
+    jti = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Revoked token {self.jti}"
+
+
+# -----skills taxonomy------
+# see accounts/taxonomy.py; any change bumps TaxonomyVersion
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    # counted by the ATS score
+    ats = models.BooleanField(default=False)
+
+    def save(self, *args, **kwargs):
+        # matched against lowercased text
+        self.name = self.name.strip().lower()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillSynonym(models.Model):
+    # another way of writing the skill: "k8s" is found as "kubernetes"
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='synonyms')
+    name = models.CharField(max_length=100, unique=True)
+
+    def save(self, *args, **kwargs):
+        self.name = self.name.strip().lower()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.name} -> {self.skill_id}"
+
+
+class JobRole(models.Model):
+
+    JOB_MATCHER = 'MATCHER'
+    SKILL_GAP = 'SKILL_GAP'
+
+    ANALYSIS_CHOICES = (
+        (JOB_MATCHER, 'Job matcher'),
+        (SKILL_GAP, 'Skill gap'),
+    )
+
+    name = models.CharField(max_length=100)
+    analysis = models.CharField(max_length=10, choices=ANALYSIS_CHOICES)
+    # listed in the order they were added
+    skills = models.ManyToManyField(Skill, related_name='roles')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'analysis'], name='jobrole_name_analysis_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_analysis_display()})"
+
+
+class TaxonomyVersion(models.Model):
+    # a single row
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Taxonomy version {self.version}"
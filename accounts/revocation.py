@@ -0,0 +1,159 @@
+"""
+Revoked refresh tokens.
+
+Rotation revokes the refresh token it was handed (``revoke``), so each one
+works once. Revocations are ``RevokedToken`` rows, and every process keeps
+a Bloom filter of them: ``is_revoked`` answers "no" for a live token, the
+common case, without a query, and only a filter hit (a revoked token, or a
+false positive at ``JWT_REVOCATION_ERROR_RATE``) is confirmed against the
+table.
+
+The filter picks up other processes' revocations every
+``JWT_REVOCATION_SYNC_INTERVAL`` seconds. Until then the unique ``jti``
+still stops a token from being rotated twice: ``revoke`` fails. Every
+``JWT_REVOCATION_REBUILD_INTERVAL`` seconds, rows of tokens that have
+expired anyway are deleted and the filter is rebuilt without them.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+
+from .models import RevokedToken
+
+# re-read this much before the last sync, for inserts that committed late
+SYNC_OVERLAP = timedelta(seconds=30)
+LOAD_CHUNK = 10000
+
+
+def _hashes(key):
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+
+class BloomFilter:
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # double hashing; both halves are reduced first so update() computes
+        # the same positions without overflowing 64 bits
+        h1, h2 = _hashes(key)
+        h1, h2 = h1 % self.size, h2 % self.size
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def update(self, keys):
+        keys = list(keys)
+        if not keys:
+            return
+        digests = np.frombuffer(
+            b''.join(hashlib.blake2b(key.encode(), digest_size=16).digest() for key in keys),
+            dtype='<u8',
+        ).reshape(-1, 2) % np.uint64(self.size)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        positions = ((digests[:, :1] + steps * digests[:, 1:]) % np.uint64(self.size)).ravel()
+
+        bits = np.frombuffer(self._bits, dtype=np.uint8)
+        np.bitwise_or.at(
+            bits,
+            (positions >> np.uint64(3)).astype(np.intp),
+            np.left_shift(1, positions & np.uint64(7)).astype(np.uint8),
+        )
+
+    def __contains__(self, key):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class _Revocations:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._synced_at = None
+        self._next_sync = 0.0
+        self._next_rebuild = 0.0
+
+    def current(self):
+        """The filter, synced if due; None until the first build finishes."""
+        clock = time.monotonic()
+        # one thread syncs, the others carry on with the filter they have
+        if clock >= self._next_sync and self._lock.acquire(blocking=False):
+            try:
+                if clock >= self._next_rebuild:
+                    self._rebuild()
+                    self._next_rebuild = clock + settings.JWT_REVOCATION_REBUILD_INTERVAL
+                else:
+                    self._load(self._filter, self._synced_at - SYNC_OVERLAP)
+                self._next_sync = clock + settings.JWT_REVOCATION_SYNC_INTERVAL
+            finally:
+                self._lock.release()
+        return self._filter
+
+    def add(self, jti):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def _rebuild(self):
+        RevokedToken.objects.filter(expires_at__lte=now()).delete()
+        live = RevokedToken.objects.count()
+        bloom = BloomFilter(
+            max(settings.JWT_REVOCATION_CAPACITY, 2 * live), settings.JWT_REVOCATION_ERROR_RATE
+        )
+        self._load(bloom)
+        self._filter = bloom
+
+    def _load(self, bloom, since=None):
+        started = now()
+        rows = RevokedToken.objects.filter(expires_at__gt=started)
+        if since is not None:
+            rows = rows.filter(revoked_at__gte=since)
+
+        chunk = []
+        for jti in rows.values_list('jti', flat=True).iterator(chunk_size=LOAD_CHUNK):
+            chunk.append(jti)
+            if len(chunk) == LOAD_CHUNK:
+                bloom.update(chunk)
+                chunk = []
+        bloom.update(chunk)
+        self._synced_at = started
+
+
+_revocations = _Revocations()
+
+
+def is_revoked(jti):
+    bloom = _revocations.current()
+    if bloom is not None and jti not in bloom:
+        return False
+    return RevokedToken.objects.filter(jti=jti).exists()
+
+
+def revoke(jti, expires):
+    """
+    Revoke the token ``jti``, which expires at the Unix time ``expires``.
+    Returns False if it already was revoked.
+    """
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(
+                jti=jti, expires_at=datetime.fromtimestamp(expires, tz=timezone.utc)
+            )
+    except IntegrityError:
+        return False
+    _revocations.add(jti)
+    return True
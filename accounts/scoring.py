@@ -0,0 +1,221 @@
+"""
+Scoring rules for the analysis endpoints.
+
+Everything here works on a ``ResumeFeatures`` row and returns the response
+payload. Bump ``RULESET_VERSION`` whenever a change here alters a payload;
+cached results are keyed on it, and on the skills taxonomy version.
+"""
+import re
+
+import numpy as np
+
+from . import taxonomy
+from .keywords import ACTION_VERBS, SECTIONS
+
+RULESET_VERSION = 3
+
+# ATS score weights
+SKILL_POINTS = 5
+SKILL_CAP = 30
+SECTION_POINTS = 6
+EMAIL_POINTS = 8
+PHONE_POINTS = 7
+LENGTH_BANDS = (
+    # (min words, max words, points)
+    (400, 1200, 10),
+    (250, 399, 5),
+)
+ACTION_VERB_POINTS = 10
+MAX_SCORE = 100
+
+JOB_MATCH_THRESHOLD = 40
+
+# most terms listed in a weighted job description match response, which
+# lists them heaviest first; basic mode has no weights to rank by and lists all
+JD_TOP_K = 25
+
+
+def length_points(word_count):
+    for low, high, points in LENGTH_BANDS:
+        if low <= word_count <= high:
+            return points
+    return 0
+
+
+def ats_score(features):
+    score = min(SKILL_CAP, len(features.skills) * SKILL_POINTS)
+    score += len(features.sections) * SECTION_POINTS
+
+    if features.has_email:
+        score += EMAIL_POINTS
+    if features.has_phone:
+        score += PHONE_POINTS
+
+    score += length_points(features.word_count)
+
+    keywords = set(features.keywords)
+    if any(verb in keywords for verb in ACTION_VERBS):
+        score += ACTION_VERB_POINTS
+
+    return min(score, MAX_SCORE)
+
+
+def ats_scores(keywords, has_email, has_phone, word_count):
+    """
+    Vectorized ``ats_score`` for many resumes at once.
+
+    ``keywords`` is a list of matched-keyword lists (``ResumeFeatures.keywords``);
+    the other arguments are equally long sequences. Returns an int array.
+    """
+    # one column range per group, so a name in two groups counts in both
+    groups = (taxonomy.current().ats_skills, SECTIONS, ACTION_VERBS)
+    bounds = np.cumsum([0] + [len(group) for group in groups])
+    columns = [
+        {keyword: start + index for index, keyword in enumerate(group)}
+        for start, group in zip(bounds, groups)
+    ]
+    presence = np.zeros((len(keywords), bounds[-1]), dtype=bool)
+    for row, found in enumerate(keywords):
+        presence[row, [group[k] for group in columns for k in found if k in group]] = True
+
+    skills, sections, verbs = (presence[:, start:end] for start, end in zip(bounds, bounds[1:]))
+
+    word_count = np.asarray(word_count)
+
+    score = np.minimum(SKILL_CAP, skills.sum(axis=1) * SKILL_POINTS)
+    score += sections.sum(axis=1) * SECTION_POINTS
+    score += np.asarray(has_email, dtype=bool) * EMAIL_POINTS
+    score += np.asarray(has_phone, dtype=bool) * PHONE_POINTS
+    score += np.select(
+        [(word_count >= low) & (word_count <= high) for low, high, _ in LENGTH_BANDS],
+        [points for _, _, points in LENGTH_BANDS],
+        default=0,
+    )
+    score += verbs.any(axis=1) * ACTION_VERB_POINTS
+
+    return np.minimum(score, MAX_SCORE)
+
+
+def ats_analysis(features):
+    return {
+        "ATS_score": ats_score(features),
+        "skills_found": features.skills,
+        "sections_found": features.sections,
+        "word_count": features.word_count,
+        "message": "ATS analysis complete"
+    }
+
+
+def job_matches(features):
+    found = set(features.keywords)
+    matches = []
+
+    for role, skills in taxonomy.current().job_match_roles:
+        matched_skills = [skill for skill in skills if skill in found]
+        score = int((len(matched_skills) / len(skills)) * 100)
+
+        if score >= JOB_MATCH_THRESHOLD:
+            matches.append({
+                "role": role,
+                "match_percentage": score,
+                "matched_skills": matched_skills
+            })
+
+    # sort by highest match ------------
+    matches.sort(key=lambda x: x['match_percentage'], reverse=True)
+
+    if not matches:
+        return {
+            "message": "No strong job matches found. Consider adding more skills."
+        }
+
+    return {
+        "recommended_roles": matches,
+        "message": "Job matching completed successfully"
+    }
+
+
+def skill_gap(features):
+    found = set(features.keywords)
+
+    best_role = None
+    highest_score = 0
+    missing_skills_output = []
+
+    for role, skills in taxonomy.current().skill_gap_roles:
+        score = len([skill for skill in skills if skill in found])
+
+        if score > highest_score:
+            highest_score = score
+            best_role = role
+            missing_skills_output = [skill for skill in skills if skill not in found]
+
+    if not best_role:
+        return {
+            "message": "Could not determine a suitable role."
+        }
+
+    return {
+        "recommended_role": best_role,
+        "skills_you_have": highest_score,
+        "missing_skills": missing_skills_output,
+        "message": "Skill gap analysis completed"
+    }
+
+
+def job_description_match(features, job_description):
+    # "basic" mode: every word of the posting counts the same
+    job_text = re.sub(r'\s+', ' ', job_description.lower())
+
+    # extracting keyword
+    job_skills = set(re.findall(r'\b\w+\b', job_text))
+    resume_skills = set(features.tokens)
+
+    matched_skills = sorted(resume_skills & job_skills)
+    missing_skills = sorted(job_skills - resume_skills)
+
+    #scoring
+    if job_skills:
+        match_score = round(len(matched_skills) / len(job_skills) * 100)
+    else:
+        match_score = 0
+
+    return {
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
+        "match_score": match_score,
+        "scoring": "basic",
+        "message": "Job description analyzed successfully"
+    }
+
+
+def weighted_job_description_match(features, job_terms):
+    """
+    ``job_terms`` comes from ``jd.parse``: (term, weight, is_phrase), heaviest
+    first. The score is the share of the posting's total weight the resume
+    covers, so rare, repeated terms count most and stopwords not at all.
+    """
+    tokens = set(features.tokens)
+    keywords = set(features.keywords)
+
+    matched_skills = []
+    missing_skills = []
+    matched_weight = total_weight = 0.0
+
+    for term, weight, is_phrase in job_terms:
+        total_weight += weight
+        if term in (keywords if is_phrase else tokens):
+            matched_weight += weight
+            matched_skills.append(term)
+        else:
+            missing_skills.append(term)
+
+    match_score = round(matched_weight / total_weight * 100) if total_weight else 0
+
+    return {
+        "matched_skills": matched_skills[:JD_TOP_K],
+        "missing_skills": missing_skills[:JD_TOP_K],
+        "match_score": match_score,
+        "scoring": "weighted",
+        "message": "Job description analyzed successfully"
+    }
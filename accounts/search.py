@@ -0,0 +1,130 @@
+"""
+Inverted index over resume text and BM25 ranking for recruiter search.
+
+Every user's latest extracted resume is one ``SearchDocument`` with a
+``SearchPosting`` (term, tf) row per distinct term. A query only reads the
+posting lists of its own terms and scores them with NumPy, so it never
+loads resume text.
+"""
+import re
+from collections import Counter
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from .models import Resume, SearchDocument, SearchPosting
+
+WORD_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because
+been before being below between both but by can could did do does doing down
+during each etc few for from further had has have having he her here hers him
+his how i if in into is it its itself just me more most my no nor not now of
+off on once only or other our ours out over own per same she should so some
+such than that the their theirs them then there these they this those through
+to too under until up us very via was we were what when where which while who
+whom why will with within without would you your yours
+""".split())
+
+MAX_TERM_LENGTH = 64
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def index_terms(text):
+    counts = Counter(WORD_RE.findall((text or "").lower()))
+    return {
+        term: tf for term, tf in counts.items()
+        if term not in STOPWORDS
+        and len(term) > 1
+        and len(term) <= MAX_TERM_LENGTH
+        and not term.isdigit()
+    }
+
+
+def query_terms(text):
+    return list(index_terms(text))
+
+
+def index_resume(resume, text):
+    """
+    Make ``resume`` its owner's searchable document, replacing older ones.
+    Called whenever a resume's text becomes available.
+    """
+    # a slow job for an older upload must not replace a newer resume
+    if Resume.objects.filter(user_id=resume.user_id, pk__gt=resume.pk).exists():
+        return None
+
+    terms = index_terms(text)
+    length = sum(terms.values())
+
+    with transaction.atomic():
+        SearchDocument.objects.filter(resume__user_id=resume.user_id).delete()
+        document = SearchDocument.objects.create(resume=resume, length=length)
+        SearchPosting.objects.bulk_create(
+            [
+                SearchPosting(document=document, term=term, tf=tf, doc_length=length)
+                for term, tf in terms.items()
+            ],
+            batch_size=500,
+        )
+    return document
+
+
+def _posting_list(term):
+    rows = SearchPosting.objects.filter(term=term).values_list('document_id', 'tf', 'doc_length')
+    return np.array(list(rows), dtype=np.int64).reshape(-1, 3)
+
+
+def rank(query, limit=20):
+    """
+    Return (total documents, [(resume id, score, matched terms), ...]) for
+    the ``limit`` best matches to ``query`` by BM25.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return 0, []
+
+    corpus = SearchDocument.objects.aggregate(total=Count('pk'), avg_length=Avg('length'))
+    total, avg_length = corpus['total'], corpus['avg_length'] or 1.0
+    if not total:
+        return 0, []
+
+    postings = [_posting_list(term) for term in terms]
+    if not any(len(plist) for plist in postings):
+        return total, []
+
+    df = np.array([len(plist) for plist in postings])
+    term_ids = np.repeat(np.arange(len(terms)), df)
+    matrix = np.concatenate(postings)
+    doc_ids = matrix[:, 0]
+    tf = matrix[:, 1].astype(np.float64)
+    lengths = matrix[:, 2].astype(np.float64)
+
+    idf = np.log1p((total - df + 0.5) / (df + 0.5))
+
+    contribution = idf[term_ids] * tf * (K1 + 1) / (
+        tf + K1 * (1 - B + B * lengths / avg_length)
+    )
+
+    documents, slots = np.unique(doc_ids, return_inverse=True)
+    scores = np.bincount(slots, weights=contribution)
+
+    limit = min(limit, len(documents))
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top], kind='stable')]
+
+    position = {int(slot): index for index, slot in enumerate(top)}
+    matched = [[] for _ in top]
+    for row in np.flatnonzero(np.isin(slots, top)):
+        matched[position[int(slots[row])]].append(terms[term_ids[row]])
+
+    results = [
+        (int(documents[slot]), float(scores[slot]), sorted(matched[index]))
+        for index, slot in enumerate(top)
+    ]
+    return total, results
@@ -1,6 +1,33 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from . import revocation
+from .authentication import ClaimsRefreshToken, add_claims
 from .models import CustomUser , Resume
+from .uploads import RESUME_EXTENSIONS
+from django.db.models import Q
+from django.db.models.functions import Lower
 import re
+
+
+def existing_emails(emails):
+    """
+    Lowercased addresses among ``emails`` that already belong to a user.
+    Matches the case-insensitive unique constraint, and is answered from it.
+    """
+    return set(
+        CustomUser.objects.annotate(email_lower=Lower('email'))
+        .filter(~Q(email=''), email_lower__in={email.lower() for email in emails})
+        .values_list('email_lower', flat=True)
+    )
+
+
+def email_taken(email):
+    return bool(existing_emails([email]))
+
+
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
@@ -9,7 +36,7 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ['username', 'email', 'password']
     
     def validate_email(self, value):
-        if CustomUser.objects.filter(email=value).exists():
+        if value and email_taken(value):
             raise serializers.ValidationError("Email is already in use.")
         return value
 
@@ -45,3 +72,54 @@ class ResumeSerializer(serializers.ModelSerializer):
         model = Resume
         fields = ['id', 'file','extracted_text', 'uploaded_at']
         read_only_fields = ['extracted_text']
+
+    def validate_file(self, value):
+        # extraction runs later in a worker, so reject what it can't parse now
+        if not value.name.lower().endswith(RESUME_EXTENSIONS):
+            raise serializers.ValidationError(
+                "Unsupported file type. Only PDF and DOCX are allowed."
+            )
+        return value
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    simplejwt's refresh, with the role claims re-read from the user it
+    already loads, so they don't outlive a change by more than one access
+    token. With rotation, the old refresh token is revoked: a second use
+    is rejected.
+    """
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        jti = refresh[jwt_settings.JTI_CLAIM]
+        if revocation.is_revoked(jti):
+            raise TokenError("Token is revoked")
+
+        user = CustomUser.objects.filter(
+            pk=refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        ).first()
+        if not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'], 'no_active_account'
+            )
+        add_claims(refresh, user)
+
+        data = {'access': str(refresh.access_token)}
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            # the unique insert also catches two requests rotating it at once
+            if jwt_settings.BLACKLIST_AFTER_ROTATION and not revocation.revoke(jti, refresh['exp']):
+                raise TokenError("Token is revoked")
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+
+        return data
@@ -0,0 +1,21 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import taxonomy
+from .models import JobRole, Skill, SkillSynonym
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=SkillSynonym)
+@receiver(post_save, sender=JobRole)
+@receiver(post_delete, sender=Skill)
+@receiver(post_delete, sender=SkillSynonym)
+@receiver(post_delete, sender=JobRole)
+def taxonomy_changed(sender, **kwargs):
+    taxonomy.bump()
+
+
+@receiver(m2m_changed, sender=JobRole.skills.through)
+def role_skills_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        taxonomy.bump()
@@ -0,0 +1,121 @@
+"""
+The skills taxonomy (``Skill``, ``SkillSynonym``, ``JobRole``) as the
+analysis code sees it.
+
+Each process compiles the tables into one immutable ``Taxonomy``: the
+keyword matcher, the ATS skills and both role lists. ``current()`` hands
+it out from memory; every ``TAXONOMY_CHECK_INTERVAL`` seconds one caller
+reads ``TaxonomyVersion`` and, only if it moved, builds a new snapshot
+while the other threads carry on with the old one.
+
+Async code must call ``acurrent()`` once per request, before anything else
+reads the taxonomy: on the event loop ``current()`` never queries and just
+returns the snapshot ``acurrent()`` refreshed.
+
+Saving or deleting taxonomy rows bumps the version (accounts/signals.py).
+After bulk edits that bypass signals, call ``bump()``.
+"""
+import asyncio
+import threading
+import time
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import F
+
+from .keywords import ACTION_VERBS, SECTIONS
+from .matching import KeywordMatcher
+from .models import JobRole, Skill, SkillSynonym, TaxonomyVersion
+
+Taxonomy = namedtuple(
+    'Taxonomy', ['version', 'matcher', 'ats_skills', 'job_match_roles', 'skill_gap_roles']
+)
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _version():
+    return TaxonomyVersion.objects.values_list('version', flat=True).first() or 0
+
+
+def build(version):
+    skills = dict(Skill.objects.order_by('id').values_list('id', 'name'))
+    ats_skills = tuple(Skill.objects.filter(ats=True).order_by('id').values_list('name', flat=True))
+    synonyms = dict(SkillSynonym.objects.values_list('name', 'skill__name'))
+
+    roles = {JobRole.JOB_MATCHER: {}, JobRole.SKILL_GAP: {}}
+    role_names = {}
+    for pk, name, analysis in JobRole.objects.order_by('id').values_list('id', 'name', 'analysis'):
+        roles[analysis][name] = []
+        role_names[pk] = (analysis, name)
+    links = JobRole.skills.through.objects.order_by('id').values_list('jobrole_id', 'skill_id')
+    for role_id, skill_id in links:
+        analysis, name = role_names[role_id]
+        roles[analysis][name].append(skills[skill_id])
+
+    def frozen(by_name):
+        return tuple((name, tuple(role_skills)) for name, role_skills in by_name.items() if role_skills)
+
+    return Taxonomy(
+        version=version,
+        matcher=KeywordMatcher(list(skills.values()) + SECTIONS + ACTION_VERBS, synonyms),
+        ats_skills=ats_skills,
+        job_match_roles=frozen(roles[JobRole.JOB_MATCHER]),
+        skill_gap_roles=frozen(roles[JobRole.SKILL_GAP]),
+    )
+
+
+class _Snapshots:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._taxonomy = None
+        self._next_check = 0.0
+
+    def due(self):
+        return self._taxonomy is None or time.monotonic() >= self._next_check
+
+    def current(self):
+        if self._taxonomy is not None and _in_event_loop():
+            # no queries here; acurrent() does the checks for async callers
+            return self._taxonomy
+        if self._taxonomy is None:
+            # nothing to fall back on: wait for the first build
+            with self._lock:
+                if self._taxonomy is None:
+                    self._taxonomy = build(_version())
+                    self._next_check = time.monotonic() + settings.TAXONOMY_CHECK_INTERVAL
+        elif time.monotonic() >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                version = _version()
+                if version != self._taxonomy.version:
+                    self._taxonomy = build(version)
+                self._next_check = time.monotonic() + settings.TAXONOMY_CHECK_INTERVAL
+            finally:
+                self._lock.release()
+        return self._taxonomy
+
+
+_snapshots = _Snapshots()
+
+
+def current():
+    return _snapshots.current()
+
+
+async def acurrent():
+    """``current()`` for async views; a check that's due runs in a thread."""
+    if _snapshots.due():
+        return await sync_to_async(_snapshots.current)()
+    return _snapshots.current()
+
+
+def bump():
+    TaxonomyVersion.objects.update(version=F('version') + 1)
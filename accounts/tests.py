@@ -1,3 +1,777 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import uuid
+import zipfile
+import zlib
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import docx
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import analysis_cache, authentication, metrics, revocation, scoring, search, taxonomy
+from .admin_views import ANALYTICS_CACHE_KEY
+from .authentication import (
+    CachedUserJWTAuthentication, ClaimsRefreshToken, ClaimsUser, StatelessJWTAuthentication,
+)
+from .extraction import EXTRACTOR_VERSION, ExtractionResult
+from .features import get_features
+from .jobs import enqueue_extraction, fail_job
+from .management.commands import run_extraction_workers as workers
+from .management.commands._checkpoint import Checkpoint
+from .models import (
+    CustomUser, ExtractedText, JobRole, Resume, ResumeExtractionJob, RevokedToken, Skill,
+)
+from .utils import extract_resume_from_path
+
+RESUME_TEXT = (
+    "Jane Doe jane@example.com +1 555 123 4567\n"
+    "Skills: python, django, sql, docker, k8s\n"
+    "Experience: developed and built backend services.\n"
+    "Education: BSc Computer Science. Projects: resume analyzer."
+)
+
+
+def use_temp_media(test):
+    """Point MEDIA_ROOT at a directory removed after ``test``."""
+    media = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, media)
+    override = override_settings(MEDIA_ROOT=media)
+    override.enable()
+    test.addCleanup(override.disable)
+    return media
+
+
+def write_docx(resume):
+    document = docx.Document()
+    document.add_paragraph(f'Python developer, file {resume.file.name}')
+    os.makedirs(os.path.dirname(resume.file.path), exist_ok=True)
+    document.save(resume.file.path)
+
+
+class AnalysisFixture:
+    """A user with an extracted resume, and no caches carried over between tests."""
+
+    def setUp(self):
+        taxonomy._snapshots = taxonomy._Snapshots()
+        analysis_cache._local.clear()
+        authentication._users.clear()
+        revocation._revocations = revocation._Revocations()
+        cache.clear()
+
+        self.user = CustomUser.objects.create_user('jane', 'jane@example.com', 'pw-12345678')
+        self.text = ExtractedText.objects.create(
+            sha256='a' * 64, extractor_version=1, text=RESUME_TEXT, length=len(RESUME_TEXT)
+        )
+        self.resume = Resume.objects.create(
+            user=self.user, file='resumes/jane.pdf', content_hash='a' * 64, extracted=self.text
+        )
+        self.resume.make_current()
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        self.auth = {'headers': {'Authorization': f'Bearer {token}'}}
+
+
+class AnalysisTestCase(AnalysisFixture, TestCase):
+    pass
+
+
+# ---------- AUTHENTICATION ----------
+class AuthenticationTests(AnalysisTestCase):
+
+    def _request(self, token):
+        return RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_claims_user_without_a_query(self):
+        request = self._request(ClaimsRefreshToken.for_user(self.user).access_token)
+        with self.assertNumQueries(0):
+            user, _ = StatelessJWTAuthentication().authenticate(request)
+
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual((user.id, user.role, user.is_staff), (self.user.pk, 'USER', False))
+
+    def test_token_without_claims_is_refused_by_stateless_endpoints(self):
+        token = RefreshToken.for_user(self.user).access_token
+        response = self.client.get(
+            '/api/accounts/analyze-resume/', headers={'Authorization': f'Bearer {token}'}
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_cached_user_is_copied_per_request(self):
+        request = self._request(ClaimsRefreshToken.for_user(self.user).access_token)
+        first, _ = CachedUserJWTAuthentication().authenticate(request)
+        first.first_name = 'changed in one request'
+
+        with self.assertNumQueries(0):
+            second, _ = CachedUserJWTAuthentication().authenticate(request)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.first_name, '')
+
+    def test_admin_endpoints_check_staff_against_the_user_row(self):
+        self.user.is_staff = True
+        self.user.save()
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        CustomUser.objects.filter(pk=self.user.pk).update(is_staff=False)
+
+        response = self.client.get(
+            '/api/accounts/admin/analytics/', headers={'Authorization': f'Bearer {token}'}
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+# ---------- TOKEN REVOCATION ----------
+class TokenRotationTests(AnalysisTestCase):
+
+    def _refresh(self, token):
+        return self.client.post('/api/token/refresh/', {'refresh': str(token)})
+
+    def test_rotated_refresh_token_works_once(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+
+        response = self._refresh(refresh)
+        self.assertEqual(response.status_code, 200)
+        rotated = response.json()['refresh']
+        self.assertNotEqual(rotated, str(refresh))
+
+        response = self._refresh(refresh)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self._refresh(rotated).status_code, 200)
+
+    def test_refresh_re_reads_the_role_claims(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        CustomUser.objects.filter(pk=self.user.pk).update(role='ADMIN')
+
+        access = self._refresh(refresh).json()['access']
+        user, _ = StatelessJWTAuthentication().authenticate(
+            RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        )
+        self.assertEqual(user.role, 'ADMIN')
+
+    def test_revocation_by_another_process_is_seen_after_a_sync(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        self.assertFalse(revocation.is_revoked(refresh['jti']))
+
+        # inserted directly, as another process's rotation would
+        RevokedToken.objects.create(jti=refresh['jti'], expires_at=now() + timedelta(days=1))
+        revocation._revocations._next_sync = 0
+        self.assertEqual(self._refresh(refresh).status_code, 401)
+
+
+class BloomFilterTests(TestCase):
+
+    def setUp(self):
+        revocation._revocations = revocation._Revocations()
+
+    def test_no_false_negatives_whether_added_or_bulk_loaded(self):
+        added = revocation.BloomFilter(1000, 0.01)
+        loaded = revocation.BloomFilter(1000, 0.01)
+        keys = [uuid.uuid4().hex for _ in range(1000)]
+        for key in keys:
+            added.add(key)
+        loaded.update(keys)
+
+        self.assertEqual(added._bits, loaded._bits)
+        self.assertTrue(all(key in loaded for key in keys))
+
+    def test_false_positive_falls_through_to_the_table(self):
+        revoked = uuid.uuid4().hex
+        self.assertTrue(revocation.revoke(revoked, 4102444800))
+        revocation._revocations.current()  # built before counting queries
+
+        with mock.patch.object(revocation.BloomFilter, '__contains__', return_value=True):
+            with self.assertNumQueries(1):
+                self.assertFalse(revocation.is_revoked(uuid.uuid4().hex))
+            self.assertTrue(revocation.is_revoked(revoked))
+
+    def test_revoking_twice_fails(self):
+        jti = uuid.uuid4().hex
+        self.assertTrue(revocation.revoke(jti, 4102444800))
+        self.assertFalse(revocation.revoke(jti, 4102444800))
+
+
+# ---------- KEYWORD MATCHING ----------
+class KeywordMatcherTests(TestCase):
+
+    def _find(self, text):
+        return taxonomy.current().matcher.find(text)
+
+    def test_keywords_inside_longer_words_do_not_match(self):
+        found = self._find("JavaScript and NoSQL stores, reactive programming, MySQL")
+
+        self.assertIn('javascript', found)
+        for keyword in ('java', 'sql', 'react'):
+            with self.subTest(keyword=keyword):
+                self.assertNotIn(keyword, found)
+
+    def test_multi_word_synonyms(self):
+        self.assertIn('aws', self._find("Deployed on Amazon Web Services."))
+        self.assertNotIn('aws', self._find("Amazon web shop, services team"))
+
+    def test_separated_tokens_match_their_parts(self):
+        self.assertLessEqual({'node', 'sql'}, self._find("node.js, PL/SQL"))
+
+
+# ---------- TAXONOMY ----------
+class TaxonomyTests(AnalysisTestCase):
+
+    def _get(self, path, etag=None):
+        headers = {'If-None-Match': etag} if etag else {}
+        return self.client.get(path, headers={**self.auth['headers'], **headers})
+
+    def _expire_check(self):
+        taxonomy._snapshots._next_check = 0
+
+    def test_synonyms_match_as_their_skill(self):
+        # the resume says "k8s"
+        self.assertIn('kubernetes', get_features(self.resume).keywords)
+
+    def test_unchanged_taxonomy_answers_304(self):
+        etag = self._get('/api/accounts/job-matcher/')['ETag']
+        self._expire_check()
+        self.assertEqual(self._get('/api/accounts/job-matcher/', etag).status_code, 304)
+
+    def test_edit_invalidates_cached_analyses_and_etags(self):
+        matches = self._get('/api/accounts/job-matcher/')
+        ats = self._get('/api/accounts/analyze-resume/')
+        self.assertNotIn('backend', ats.json()['skills_found'])
+
+        role = JobRole.objects.create(name='Platform Engineer', analysis=JobRole.JOB_MATCHER)
+        role.skills.add(Skill.objects.get(name='docker'), Skill.objects.get(name='kubernetes'))
+        Skill.objects.create(name='Backend', ats=True)
+        self._expire_check()
+
+        response = self._get('/api/accounts/job-matcher/', matches['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], matches['ETag'])
+        self.assertIn(
+            'Platform Engineer', [match['role'] for match in response.json()['recommended_roles']]
+        )
+
+        response = self._get('/api/accounts/analyze-resume/', ats['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('backend', response.json()['skills_found'])
+
+
+class AsyncTaxonomyTests(AnalysisTestCase):
+
+    async def test_check_due_mid_request_does_not_query_on_event_loop(self):
+        acurrent = taxonomy.acurrent
+
+        async def then_expire():
+            snapshot = await acurrent()
+            # the check interval runs out right after the request's refresh
+            taxonomy._snapshots._next_check = 0
+            return snapshot
+
+        with mock.patch.object(taxonomy, 'acurrent', then_expire):
+            response = await self.async_client.get('/api/accounts/async/analyze-resume/', **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ATS_score', response.json())
+
+
+# ---------- SCORING ----------
+class AtsScoreTests(AnalysisTestCase):
+
+    def _scores(self):
+        features = get_features(self.resume)
+        vectorized = scoring.ats_scores(
+            [features.keywords], [features.has_email], [features.has_phone], [features.word_count]
+        )
+        return vectorized[0], scoring.ats_score(features)
+
+    def test_skills_named_like_a_section_or_verb_count_in_both(self):
+        before, _ = self._scores()
+        Skill.objects.create(name='projects', ats=True)
+        Skill.objects.create(name='developed', ats=True)
+        taxonomy._snapshots._next_check = 0
+
+        vectorized, scalar = self._scores()
+        self.assertEqual(vectorized, scalar)
+        self.assertEqual(vectorized, before + 2 * scoring.SKILL_POINTS)
+
+
+# ---------- JOB DESCRIPTION ----------
+class JobDescriptionTests(AnalysisTestCase):
+
+    def test_both_scoring_modes(self):
+        for mode in ('weighted', 'basic'):
+            response = self.client.post(
+                '/api/accounts/job-description-match/',
+                {'job_description': 'Backend engineer: python, django and kubernetes', 'mode': mode},
+                **self.auth,
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['scoring'], mode)
+
+    def test_long_postings(self):
+        filler = [f'tool{a}{b}' for a in 'abcdef' for b in 'abcdef']
+        posting = ' '.join(filler + ['python'] + ['zookeeper'] * 5)
+
+        def match(mode):
+            response = self.client.post(
+                '/api/accounts/job-description-match/',
+                {'job_description': posting, 'mode': mode}, **self.auth,
+            )
+            return response.json()
+
+        # basic: nothing to rank by, so nothing is dropped
+        basic = match('basic')
+        self.assertEqual(basic['matched_skills'], ['python'])
+        self.assertEqual(basic['missing_skills'], sorted(filler + ['zookeeper']))
+
+        # weighted: capped, keeping the heaviest terms
+        weighted = match('weighted')
+        self.assertEqual(len(weighted['missing_skills']), scoring.JD_TOP_K)
+        self.assertEqual(weighted['missing_skills'][0], 'zookeeper')
+
+
+# ---------- METRICS ----------
+class ReplicaMetricsTests(AnalysisFixture, TransactionTestCase):
+    # outside TestCase's transaction, read_replica views really read from the replica
+    databases = {'default', 'replica'}
+
+    def test_replica_queries_are_counted(self):
+        endpoint = 'api/accounts/analyze-resume/'
+        before = metrics.db_queries.value(endpoint)
+
+        with CaptureQueriesContext(connections['replica']) as replica:
+            with CaptureQueriesContext(connections['default']) as default:
+                response = self.client.get('/' + endpoint, **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(replica), 0)
+        # commits are logged, but aren't statements that execute wrappers see
+        queries = [
+            query for query in replica.captured_queries + default.captured_queries
+            if query['sql'] != 'COMMIT'
+        ]
+        self.assertEqual(metrics.db_queries.value(endpoint) - before, len(queries))
+
+
+# ---------- UPLOADS ----------
+PDF = b'%PDF-1.4\n' + b'0' * 2000
+
+
+class UploadHandlerTests(AnalysisTestCase):
+
+    def setUp(self):
+        super().setUp()
+        use_temp_media(self)
+
+    def _upload(self, name, content):
+        return self.client.post(
+            '/api/accounts/upload-resume/', {'file': SimpleUploadedFile(name, content)}, **self.auth
+        )
+
+    def test_file_is_hashed_while_it_streams_in(self):
+        response = self._upload('cv.pdf', PDF)
+
+        self.assertEqual(response.status_code, 202)
+        resume = Resume.objects.get(pk=response.json()['resume_id'])
+        self.assertEqual(resume.content_hash, hashlib.sha256(PDF).hexdigest())
+
+    def test_content_must_match_the_extension(self):
+        for name, content in [('cv.pdf', b'GIF89a' + b'0' * 100), ('cv.docx', PDF), ('cv.pdf', b'%P')]:
+            with self.subTest(name=name, content=content[:8]):
+                response = self._upload(name, content)
+                self.assertEqual(response.status_code, 415)
+        self.assertEqual(Resume.objects.count(), 1)
+
+    def test_unsupported_extension(self):
+        self.assertEqual(self._upload('cv.txt', b'plain text').status_code, 415)
+
+    @override_settings(RESUME_MAX_FILE_SIZE=1000)
+    def test_oversized_file(self):
+        response = self._upload('cv.pdf', PDF)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(Resume.objects.count(), 1)
+
+    def test_batch_keeps_the_good_files(self):
+        files = [
+            SimpleUploadedFile('good.pdf', PDF),
+            SimpleUploadedFile('bad.pdf', b'GIF89a' + b'0' * 100),
+            SimpleUploadedFile('notes.txt', b'plain text'),
+        ]
+        response = self.client.post('/api/accounts/upload-resumes/', {'files': files}, **self.auth)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['created'], response.json()['failed']), (1, 2))
+
+
+class BatchUploadTests(AnalysisTestCase):
+
+    def test_zip_members_must_match_their_extension(self):
+        use_temp_media(self)
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('good.pdf', PDF)
+            zf.writestr('junk.docx', b'not a docx file')
+            zf.writestr('renamed.pdf', b'PK\x03\x04' + b'0' * 100)
+        upload = SimpleUploadedFile('cvs.zip', archive.getvalue())
+
+        response = self.client.post('/api/accounts/upload-resumes/', {'files': [upload]}, **self.auth)
+
+        self.assertEqual(response.status_code, 201)
+        results = {result['file']: result for result in response.json()['results']}
+        self.assertIn('resume_id', results['cvs.zip/good.pdf'])
+        self.assertEqual(results['cvs.zip/junk.docx']['error'], 'File content is not a valid DOCX file.')
+        self.assertEqual(results['cvs.zip/renamed.pdf']['error'], 'File content is not a valid PDF file.')
+        stored = Resume.objects.exclude(pk=self.resume.pk).get()
+        self.assertEqual(stored.content_hash, hashlib.sha256(PDF).hexdigest())
+        with stored.file.open('rb') as fh:
+            self.assertEqual(fh.read(), PDF)
+
+    def test_more_files_than_djangos_default_limit_are_each_checked(self):
+        files = [SimpleUploadedFile(f'cv{i}.pdf', b'not a pdf') for i in range(101)]
+        response = self.client.post('/api/accounts/upload-resumes/', {'files': files}, **self.auth)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['failed'], 101)
+
+
+# ---------- ADMIN ----------
+class AdminEndpointTests(AnalysisFixture, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = CustomUser.objects.create_user(
+            'admin', 'admin@example.com', 'pw-12345678', is_staff=True, role='ADMIN'
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {ClaimsRefreshToken.for_user(self.admin).access_token}'
+        )
+
+    def test_non_staff_users_are_refused(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth['headers']['Authorization'])
+        for path in ('/api/accounts/admin/users/', '/api/accounts/admin/analytics/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 403)
+
+        self.client.credentials()
+        self.assertEqual(self.client.get('/api/accounts/admin/users/').status_code, 401)
+
+    def test_users_are_paginated_by_cursor(self):
+        for number in range(3):
+            CustomUser.objects.create_user(f'user{number}', f'user{number}@example.com')
+        expected = list(CustomUser.objects.order_by('pk').values_list('pk', flat=True))
+
+        seen, cursor = [], 0
+        while cursor is not None:
+            response = self.client.get('/api/accounts/admin/users/', {'cursor': cursor, 'limit': 2})
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            self.assertLessEqual(len(page['results']), 2)
+            seen += [user['id'] for user in page['results']]
+            cursor = page['next_cursor']
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(set(page['results'][0]), {'id', 'username', 'email', 'role', 'date_joined'})
+
+    def test_users_filtered_and_streamed(self):
+        response = self.client.get('/api/accounts/admin/users/', {'role': 'admin'})
+        self.assertEqual([user['username'] for user in response.json()['results']], ['admin'])
+
+        response = self.client.get('/api/accounts/admin/users/', {'stream': 'ndjson'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['username'] for line in lines], ['jane', 'admin'])
+
+        response = self.client.get('/api/accounts/admin/users/', {'cursor': 'first'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_analytics_aggregates(self):
+        Resume.objects.filter(pk=self.resume.pk).update(uploaded_at=now() - timedelta(days=2))
+        Resume.objects.create(user=self.user, file='resumes/jane2.pdf')
+        CustomUser.objects.create_user('idle', 'idle@example.com')
+
+        data = self.client.get('/api/accounts/admin/analytics/').json()
+
+        self.assertEqual(
+            {key: value for key, value in data.items() if key != 'generated_at'},
+            {
+                'total_users': 3,
+                'total_resumes': 2,
+                'admins': 1,
+                'uploads_today': 1,
+                'users_without_resumes': 2,
+            },
+        )
+
+    def test_analytics_snapshot_is_cached(self):
+        first = self.client.get('/api/accounts/admin/analytics/').json()
+        CustomUser.objects.create_user('late', 'late@example.com')
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/accounts/admin/analytics/').json()
+        self.assertEqual(second, first)
+
+        cache.delete(ANALYTICS_CACHE_KEY)
+        self.assertEqual(self.client.get('/api/accounts/admin/analytics/').json()['total_users'], 3)
+
+
+# ---------- CANDIDATE SEARCH ----------
+class CandidateSearchTests(AnalysisTestCase):
+
+    def test_resumes_deleted_after_ranking_are_skipped(self):
+        admin = CustomUser.objects.create_user('admin', 'admin@example.com', 'pw-12345678', is_staff=True)
+        token = ClaimsRefreshToken.for_user(admin).access_token
+        ranked = [(self.resume.pk + 100, 2.0, ['python']), (self.resume.pk, 1.0, ['python'])]
+
+        with mock.patch.object(search, 'rank', return_value=(2, ranked)):
+            response = self.client.post(
+                '/api/accounts/admin/candidate-search/', {'job_description': 'python'},
+                headers={'Authorization': f'Bearer {token}'},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([(r['rank'], r['resume_id']) for r in results], [(1, self.resume.pk)])
+
+
+# ---------- USER IMPORT ----------
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportUsersTests(TestCase):
+
+    def _import(self, *lines):
+        path = os.path.join(use_temp_media(self), 'users.csv')
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write('\n'.join(('username,email,password', *lines)) + '\n')
+        stderr = io.StringIO()
+        call_command('import_users', path, workers=1, stdout=io.StringIO(), stderr=stderr)
+        return stderr.getvalue()
+
+    def test_rows_failing_the_field_validators_are_skipped(self):
+        errors = self._import(
+            'alice,alice@example.com,Secret-123',
+            'bad name!,bad@example.com,Secret-123',
+            f"{'x' * 151},long@example.com,Secret-123",
+            'bob,not-an-email,Secret-123',
+        )
+
+        self.assertEqual(list(CustomUser.objects.values_list('username', flat=True)), ['alice'])
+        self.assertIn('line 3: username:', errors)
+        self.assertIn('line 4: username:', errors)
+        self.assertIn('line 5: email:', errors)
+
+    def test_clash_missed_by_the_batch_check_only_skips_that_row(self):
+        CustomUser.objects.create_user('jane', 'jane@example.com', 'pw-12345678')
+
+        # as if jane had signed up after the batch was checked
+        with mock.patch('accounts.management.commands.import_users.existing_emails', return_value=set()):
+            errors = self._import(
+                'alice,alice@example.com,Secret-123',
+                'janet,JANE@example.com,Secret-123',
+                'carol,carol@example.com,Secret-123',
+            )
+
+        self.assertEqual(
+            set(CustomUser.objects.values_list('username', flat=True)), {'jane', 'alice', 'carol'}
+        )
+        self.assertIn('line 3: username or email is already in use', errors)
+
+
+# ---------- EXTRACTION ----------
+class ExtractionTests(TestCase):
+
+    @override_settings(RESUME_PAGE_WORKERS=4)
+    def test_workers_hand_the_pdf_engine_a_path_and_the_page_workers(self):
+        result = ExtractionResult('text', 1, 0)
+        with mock.patch('accounts.utils.extract_pdf', return_value=result) as extract_pdf:
+            extract_resume_from_path('/media/resumes/cv.pdf')
+
+        # a path, not an open file: only then can pages go to other processes
+        self.assertEqual(extract_pdf.call_args.args, ('/media/resumes/cv.pdf',))
+        self.assertEqual(extract_pdf.call_args.kwargs['workers'], 4)
+
+
+# ---------- EXTRACTION JOBS ----------
+class ExtractionJobTests(AnalysisTestCase):
+
+    def setUp(self):
+        super().setUp()
+        use_temp_media(self)
+
+    def _job(self, name):
+        resume = Resume.objects.create(user=self.user, file=f'resumes/{name}')
+        write_docx(resume)
+        return enqueue_extraction(resume)
+
+    def test_resume_deleted_before_the_result_is_stored(self):
+        gone, kept = self._job('gone.docx'), self._job('kept.docx')
+        complete = workers.complete_job
+
+        def delete_first(job, *args, **kwargs):
+            if job.pk == gone.pk:
+                Resume.objects.filter(pk=job.resume_id).delete()
+            return complete(job, *args, **kwargs)
+
+        stdout = io.StringIO()
+        with mock.patch.object(workers, 'complete_job', delete_first):
+            call_command('run_extraction_workers', workers=1, once=True, stdout=stdout)
+
+        self.assertIn(f'Job {gone.pk} dropped', stdout.getvalue())
+        self.assertIn('Processed 1 job(s), 0 failed', stdout.getvalue())
+        self.assertFalse(ResumeExtractionJob.objects.filter(pk=gone.pk).exists())
+        kept.refresh_from_db()
+        self.assertEqual(kept.status, ResumeExtractionJob.DONE)
+        self.assertIn('file resumes/kept.docx', Resume.objects.get(pk=kept.resume_id).extracted_text)
+
+    def test_failing_a_vanished_job(self):
+        job = self._job('gone.docx')
+        job.resume.delete()
+
+        self.assertFalse(fail_job(job, 'parse error'))
+
+
+# ---------- REEXTRACT ----------
+class ReextractTests(AnalysisTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.media = use_temp_media(self)
+        self.checkpoint = os.path.join(self.media, 'reextract.json')
+
+        self.stale = ExtractedText.objects.create(
+            sha256='0' * 64, extractor_version=EXTRACTOR_VERSION - 1, text='stale'
+        )
+        self.resumes = [self._resume(f'cv{number}.docx') for number in range(3)]
+
+    def _resume(self, name):
+        return Resume.objects.create(
+            user=self.user, file=f'resumes/{name}', content_hash=name.ljust(64, '0'),
+            extracted=self.stale,
+        )
+
+    def _reextract(self):
+        call_command(
+            'reextract', workers=1, chunk_size=1, checkpoint=self.checkpoint,
+            stdout=io.StringIO(), stderr=io.StringIO(),
+        )
+
+    def test_resumes_after_an_interrupt_and_retries_failures(self):
+        first, second, third = self.resumes
+        # first has no file yet, so it fails
+        write_docx(second)
+        write_docx(third)
+
+        save = Checkpoint.save
+
+        def interrupted(checkpoint, last_pk, *args):
+            save(checkpoint, last_pk, *args)
+            if last_pk == second.pk:
+                raise KeyboardInterrupt
+
+        with mock.patch.object(Checkpoint, 'save', interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                self._reextract()
+
+        state = Checkpoint(self.checkpoint, f"extractor-{EXTRACTOR_VERSION}")
+        self.assertTrue(state.load())
+        self.assertEqual((state.last_pk, state.failed), (second.pk, [first.pk]))
+
+        write_docx(first)
+        self._reextract()
+
+        versions = {
+            resume.pk: (resume.extractor_version, resume.version)
+            for resume in Resume.objects.filter(pk__in=[first.pk, second.pk, third.pk])
+        }
+        # second is not extracted a second time
+        self.assertEqual(versions, {pk: (EXTRACTOR_VERSION, 1) for pk in versions})
+        self.assertFalse(os.path.exists(self.checkpoint))
+        self.assertIn('file resumes/cv0.docx', Resume.objects.get(pk=first.pk).extracted_text)
+
+
+# ---------- DATA MIGRATIONS ----------
+class MigrationTestCase(TransactionTestCase):
+    """
+    Migrates accounts back to ``migrate_from`` for the test to fill in rows
+    with the historical models, and ``migrate()`` then applies
+    ``migrate_to``. Schema changes can't run inside TestCase's transaction.
+    """
+    migrate_from = migrate_to = None
+
+    def setUp(self):
+        self.media = use_temp_media(self)
+
+        self.apps = self._migrate(self.migrate_from)
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def _migrate(self, name):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('accounts', name)])
+        executor.loader.build_graph()
+        return executor.loader.project_state([('accounts', name)]).apps
+
+    def migrate(self):
+        return self._migrate(self.migrate_to)
+
+
+class ExtractedTextMigrationTests(MigrationTestCase):
+    migrate_from = '0003_resumeextractionjob'
+    migrate_to = '0004_extractedtext'
+
+    def test_text_moves_to_one_row_per_file(self):
+        User = self.apps.get_model('accounts', 'CustomUser')
+        Resume = self.apps.get_model('accounts', 'Resume')
+        user = User.objects.create(username='jane')
+
+        os.makedirs(os.path.join(self.media, 'resumes'))
+        for name in ('a.pdf', 'b.pdf'):
+            with open(os.path.join(self.media, 'resumes', name), 'wb') as fh:
+                fh.write(b'%PDF-1.4 same file')
+        first = Resume.objects.create(user=user, file='resumes/a.pdf', extracted_text='Python')
+        copy = Resume.objects.create(user=user, file='resumes/b.pdf', extracted_text='Python')
+        missing = Resume.objects.create(user=user, file='resumes/gone.pdf', extracted_text='Java')
+        empty = Resume.objects.create(user=user, file='resumes/c.pdf', extracted_text=None)
+
+        apps = self.migrate()
+        Resume = apps.get_model('accounts', 'Resume')
+        ExtractedText = apps.get_model('accounts', 'ExtractedText')
+
+        self.assertEqual(ExtractedText.objects.count(), 2)
+        self.assertEqual(set(ExtractedText.objects.values_list('extractor_version', flat=True)), {0})
+        resumes = Resume.objects.select_related('extracted').in_bulk()
+        self.assertEqual(resumes[first.pk].extracted_id, resumes[copy.pk].extracted_id)
+        self.assertEqual(resumes[first.pk].extracted.text, 'Python')
+        self.assertEqual(resumes[missing.pk].extracted.text, 'Java')
+        self.assertEqual(len(resumes[missing.pk].content_hash), 64)
+        self.assertIsNone(resumes[empty.pk].extracted_id)
+
+
+class CompressTextMigrationTests(MigrationTestCase):
+    migrate_from = '0009_customuser_current_resume'
+    migrate_to = '0010_compress_extracted_text'
+
+    def test_existing_text_is_compressed_in_place(self):
+        ExtractedText = self.apps.get_model('accounts', 'ExtractedText')
+        texts = {f'{number:064x}': f'resume {number} ' * number for number in range(3)}
+        for sha256, text in texts.items():
+            ExtractedText.objects.create(sha256=sha256, extractor_version=1, text=text)
+
+        apps = self.migrate()
+        ExtractedText = apps.get_model('accounts', 'ExtractedText')
+
+        rows = ExtractedText.objects.all()
+        self.assertEqual({row.sha256: row.text for row in rows}, texts)
+        self.assertEqual({row.sha256: row.length for row in rows}, {k: len(v) for k, v in texts.items()})
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT sha256, text FROM accounts_extractedtext')
+            stored = {sha256: zlib.decompress(data).decode() for sha256, data in cursor.fetchall()}
+        self.assertEqual(stored, texts)
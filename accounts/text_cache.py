@@ -0,0 +1,116 @@
+import hashlib
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Coalesce
+
+from . import metrics
+from .extraction import EXTRACTOR_VERSION
+from .features import refresh_features_for_text
+from .models import ExtractedText
+from .search import index_resume
+
+
+def hash_file(file):
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def lookup(content_hash, extractor_version=EXTRACTOR_VERSION):
+    """
+    Return the cached text row for this content, counting the hit, or None.
+    """
+    if not content_hash:
+        return None
+
+    row = ExtractedText.objects.filter(
+        sha256=content_hash, extractor_version=extractor_version
+    ).first()
+
+    if row is not None:
+        ExtractedText.objects.filter(pk=row.pk).update(hit_count=F('hit_count') + 1)
+    metrics.text_cache.inc('miss' if row is None else 'hit')
+    return row
+
+
+def lookup_many(content_hashes, extractor_version=EXTRACTOR_VERSION):
+    """
+    ``lookup`` for many files at once: {content hash: row} for the ones
+    already cached, with each hit counted.
+    """
+    hits = Counter(content_hash for content_hash in content_hashes if content_hash)
+    if not hits:
+        return {}
+
+    rows = {
+        row.sha256: row
+        for row in ExtractedText.objects.filter(
+            sha256__in=hits, extractor_version=extractor_version
+        )
+    }
+    for content_hash, row in rows.items():
+        ExtractedText.objects.filter(pk=row.pk).update(
+            hit_count=F('hit_count') + hits[content_hash]
+        )
+
+    found = sum(hits[content_hash] for content_hash in rows)
+    metrics.text_cache.inc('hit', amount=found)
+    metrics.text_cache.inc('miss', amount=sum(hits.values()) - found)
+    return rows
+
+
+def store(content_hash, result, extractor_version=EXTRACTOR_VERSION):
+    """
+    Save a freshly parsed ``ExtractionResult``; if another worker parsed the
+    same file first, its row wins and is returned instead.
+    """
+    try:
+        with transaction.atomic():
+            return ExtractedText.objects.create(
+                sha256=content_hash,
+                extractor_version=extractor_version,
+                text=result.text,
+                length=len(result.text),
+                pages=result.pages,
+                parse_seconds=result.seconds,
+            )
+    except IntegrityError:
+        return ExtractedText.objects.get(
+            sha256=content_hash, extractor_version=extractor_version
+        )
+
+
+def attach_text(resume, row):
+    resume.extracted = row
+    resume.version = F('version') + 1
+    resume.save(update_fields=['extracted', 'version'])
+    resume.refresh_from_db(fields=['version'])
+    refresh_features_for_text(resume, row)
+    index_resume(resume, row.text)
+
+
+def stats():
+    # a miss is a parse, and every parse leaves exactly one row behind
+    totals = ExtractedText.objects.filter(
+        extractor_version=EXTRACTOR_VERSION
+    ).aggregate(
+        misses=Count('id'),
+        hits=Coalesce(Sum('hit_count'), 0),
+        spent_seconds=Coalesce(Sum('parse_seconds'), 0.0),
+        saved_seconds=Coalesce(
+            Sum(F('hit_count') * F('parse_seconds'), output_field=FloatField()), 0.0
+        ),
+    )
+
+    lookups = totals['hits'] + totals['misses']
+    return {
+        "extractor_version": EXTRACTOR_VERSION,
+        "hits": totals['hits'],
+        "misses": totals['misses'],
+        "hit_rate": round(totals['hits'] / lookups, 4) if lookups else 0.0,
+        "parse_seconds_spent": round(totals['spent_seconds'], 3),
+        "parse_seconds_saved": round(totals['saved_seconds'], 3),
+    }
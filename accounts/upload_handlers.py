@@ -0,0 +1,151 @@
+"""
+Upload handler for resume files.
+
+Replaces Django's default handlers on the upload views. Every chunk is
+checked as it arrives: the declared request size and the running file size
+against the limits, and the first bytes against the file's extension, so an
+oversized or mislabeled upload is rejected before the rest of it is read.
+Accepted files are spooled (in memory up to ``FILE_UPLOAD_MAX_MEMORY_SIZE``,
+then on disk) and hashed in the same pass.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# what the first bytes must look like for each accepted extension
+MAGIC = {
+    '.pdf': b'%PDF-',
+    '.docx': b'PK\x03\x04',
+    '.zip': b'PK\x03\x04',
+}
+SNIFF_BYTES = 8
+
+# multipart boundaries and headers on top of the file itself
+FORM_OVERHEAD = 64 * 1024
+
+
+class UploadRejected(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = 'upload_rejected'
+
+
+class FileTooLarge(UploadRejected):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+class UnsupportedFileType(UploadRejected):
+    status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+class SpooledUploadedFile(UploadedFile):
+    """An upload held in a SpooledTemporaryFile, with its SHA-256."""
+
+    def __init__(self, name, content_type, charset, content_type_extra):
+        file = tempfile.SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+            dir=settings.FILE_UPLOAD_TEMP_DIR,
+        )
+        super().__init__(file, name, content_type, 0, charset, content_type_extra)
+        self.content_hash = None
+
+
+class ResumeUploadHandler(FileUploadHandler):
+    """
+    ``extensions`` are the accepted file types. With ``skip_rejected`` a bad
+    file is dropped and noted in ``rejected`` as (name, error) while the
+    rest of the request is still parsed; otherwise the whole request fails
+    with ``UploadRejected``.
+    """
+
+    def __init__(self, request=None, extensions=('.pdf', '.docx'), max_size=None,
+                 max_request_size=None, skip_rejected=False):
+        super().__init__(request)
+        self.extensions = extensions
+        self.max_size = max_size or settings.RESUME_MAX_FILE_SIZE
+        self.max_request_size = max_request_size or self.max_size + FORM_OVERHEAD
+        self.skip_rejected = skip_rejected
+        self.rejected = []
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # nothing has been read yet, so this is the cheapest place to say no
+        if content_length and content_length > self.max_request_size:
+            raise FileTooLarge(f"Upload is larger than {self.max_request_size} bytes.")
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        # Django closes ``handler.file`` on SkipFile: drop the previous
+        # (already returned) upload so a rejection can't close it
+        if hasattr(self, 'file'):
+            del self.file
+
+        self.extension = os.path.splitext(self.file_name or '')[1].lower()
+        if self.extension not in self.extensions:
+            kinds = [extension[1:].upper() for extension in self.extensions]
+            self._reject(UnsupportedFileType(
+                f"Unsupported file type. Only {', '.join(kinds[:-1])} and {kinds[-1]} are allowed."
+            ))
+
+        self.file = SpooledUploadedFile(
+            self.file_name, self.content_type, self.charset, self.content_type_extra
+        )
+        self.digest = hashlib.sha256()
+        self.head = b''
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        # an archive may use the whole request; a single resume only max_size
+        limit = self.max_request_size if self.extension == '.zip' else self.max_size
+        self.size += len(raw_data)
+        if self.size > limit:
+            self._reject(FileTooLarge(f"File is larger than {limit} bytes."))
+
+        if len(self.head) < SNIFF_BYTES:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                error = self._sniff()
+                if error:
+                    self._reject(error)
+
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        # files shorter than SNIFF_BYTES are only checked here, where SkipFile
+        # is no longer caught: returning None drops the file instead
+        error = self._sniff() if len(self.head) < SNIFF_BYTES else None
+        if error:
+            try:
+                self._reject(error)
+            except SkipFile:
+                return None
+
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.content_hash = self.digest.hexdigest()
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.file.close()
+
+    def _sniff(self):
+        if not self.head.startswith(MAGIC[self.extension]):
+            return UnsupportedFileType(
+                f"File content is not a valid {self.extension[1:].upper()} file."
+            )
+        return None
+
+    def _reject(self, error):
+        if hasattr(self, 'file'):
+            self.file.close()
+
+        if not self.skip_rejected:
+            raise error
+        self.rejected.append((self.file_name, str(error.detail)))
+        raise SkipFile()
@@ -0,0 +1,209 @@
+"""
+Storing uploaded resumes.
+
+Single uploads go through ``store_upload``. Batches arrive either as several
+multipart parts or inside ZIP archives. Each
+one is streamed straight to storage, hashed on the way, and only then turned
+into a ``Resume``; all rows of a request are inserted together. ZIP members
+get the same first-bytes check as top-level files. Files the
+text cache already knows are attached on the spot, the rest are queued for
+``run_extraction_workers``, so extraction is spread over the worker pool
+instead of running inside the request.
+"""
+import hashlib
+import os
+import zipfile
+import zlib
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from rest_framework import status
+
+from . import text_cache
+from .jobs import enqueue_extraction, enqueue_extractions
+from .models import Resume
+from .upload_handlers import MAGIC, SNIFF_BYTES
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+
+class _HashingReader:
+    """File-like wrapper that hashes whatever is read through it."""
+
+    def __init__(self, stream, head=b''):
+        self._stream = stream
+        # bytes already read from ``stream``, handed out first
+        self._head = head
+        self.digest = hashlib.sha256()
+
+    def read(self, size=-1):
+        if self._head:
+            data, self._head = self._head, b''
+        else:
+            data = self._stream.read(size)
+        self.digest.update(data)
+        return data
+
+
+class UploadedResume:
+
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+        self.resume = None
+        self.job = None
+        self.cached = False
+
+    def as_dict(self):
+        if self.error:
+            return {"file": self.name, "error": self.error}
+
+        data = {"file": self.name, "resume_id": self.resume.id}
+        if self.cached:
+            data["status"] = "extracted"
+        else:
+            data["status"] = self.job.status
+            data["job_id"] = self.job.id
+        return data
+
+
+def store_upload(serializer, user):
+    """
+    Save a validated ``ResumeSerializer`` upload for ``user`` and return
+    the response (payload, status code).
+    """
+    file = serializer.validated_data['file']
+    content_hash = getattr(file, 'content_hash', None) or text_cache.hash_file(file)
+    with transaction.atomic():
+        resume = serializer.save(user_id=user.id, content_hash=content_hash)
+        resume.make_current()
+
+    # same bytes parsed before: share that text and skip the queue
+    cached = text_cache.lookup(content_hash)
+    if cached is not None:
+        text_cache.attach_text(resume, cached)
+        return {
+            "message": "Resume uploaded & text extracted successfully",
+            "resume_id": resume.id,
+            "text_length": cached.length,
+            "cached": True
+        }, status.HTTP_201_CREATED
+
+    job = enqueue_extraction(resume)
+
+    return {
+        "message": "Resume uploaded, text extraction queued",
+        "resume_id": resume.id,
+        "job_id": job.id,
+        "status": job.status
+    }, status.HTTP_202_ACCEPTED
+
+
+def _check(name, size):
+    if not name.lower().endswith(RESUME_EXTENSIONS):
+        return "Unsupported file type. Only PDF and DOCX are allowed."
+    if size > settings.RESUME_MAX_FILE_SIZE:
+        return f"File is larger than {settings.RESUME_MAX_FILE_SIZE} bytes."
+    if not size:
+        return "File is empty."
+    return None
+
+
+def _sniff(name, head):
+    extension = os.path.splitext(name)[1].lower()
+    if not head.startswith(MAGIC[extension]):
+        return f"File content is not a valid {extension[1:].upper()} file."
+    return None
+
+
+def _members(archive, name):
+    """(display name, size, opener) for each file in an uploaded ZIP."""
+    try:
+        zf = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile:
+        yield name, 0, None
+        return
+
+    with zf:
+        for info in zf.infolist():
+            if info.is_dir() or info.filename.startswith('__MACOSX/'):
+                continue
+            # the header's size bounds what ZipExtFile will inflate
+            yield f"{name}/{info.filename}", info.file_size, lambda info=info: zf.open(info)
+
+
+def _entries(files):
+    for upload in files:
+        if upload.name.lower().endswith('.zip'):
+            yield from _members(upload, upload.name)
+        else:
+            yield upload.name, upload.size, lambda upload=upload: upload
+
+
+def store_files(user, files):
+    """
+    Save every resume in ``files`` (uploaded files, ZIPs expanded) for
+    ``user`` and return one ``UploadedResume`` per file, in order.
+    """
+    entries = []
+    pending = []
+    limit = settings.RESUME_BATCH_MAX_FILES
+
+    try:
+        for name, size, opener in _entries(files):
+            if len(entries) >= limit:
+                entries.append(UploadedResume(name, f"Batch is limited to {limit} files."))
+                continue
+            if opener is None:
+                entries.append(UploadedResume(name, "Not a valid ZIP archive."))
+                continue
+
+            entry = UploadedResume(name, _check(name, size))
+            entries.append(entry)
+            if entry.error:
+                continue
+
+            resume = Resume(user_id=user.id)
+            try:
+                with opener() as stream:
+                    # ZIP members never went past the upload handler's check
+                    head = stream.read(SNIFF_BYTES)
+                    entry.error = _sniff(name, head)
+                    if entry.error:
+                        continue
+                    reader = _HashingReader(stream, head)
+                    resume.file.save(os.path.basename(name), File(reader), save=False)
+            except (zipfile.BadZipFile, zlib.error, EOFError):
+                entry.error = "Could not read the file from the archive."
+                continue
+            resume.content_hash = reader.digest.hexdigest()
+
+            entry.resume = resume
+            pending.append(entry)
+
+        with transaction.atomic():
+            Resume.objects.bulk_create([entry.resume for entry in pending])
+            if pending:
+                pending[-1].resume.make_current()
+    except Exception:
+        # nothing references the stored files yet
+        for entry in pending:
+            entry.resume.file.delete(save=False)
+        raise
+
+    cached = text_cache.lookup_many([entry.resume.content_hash for entry in pending])
+    queued = []
+    for entry in pending:
+        row = cached.get(entry.resume.content_hash)
+        if row is None:
+            queued.append(entry)
+        else:
+            text_cache.attach_text(entry.resume, row)
+            entry.cached = True
+
+    jobs = enqueue_extractions([entry.resume for entry in queued])
+    for entry, job in zip(queued, jobs):
+        entry.job = job
+
+    return entries
@@ -1,17 +1,30 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 from .admin_views import admin_users
 from .admin_views import admin_analytics
+from .admin_views import admin_extraction_cache
+from .admin_views import admin_candidate_search
 
 urlpatterns = [
     path('signup/', views.signup, name='signup'),
     path('login/', views.login, name='login'),
     path('upload-resume/', views.upload_resume, name='upload_resume'),
+    path('upload-resumes/', views.upload_resumes, name='upload_resumes'),
+    path('extraction-jobs/<int:job_id>/', views.extraction_job_status, name='extraction_job_status'),
     path('analyze-resume/', views.analyze_resume),
     path('job-matcher/', views.job_matcher),
     path('skill-gap/', views.skill_gap_analyzer),
     path('admin/users/', admin_users),
     path('admin/analytics/', admin_analytics),
+    path('admin/extraction-cache/', admin_extraction_cache),
+    path('admin/candidate-search/', admin_candidate_search),
     path('job-description-match/', views.job_description_matcher, name='job_description_matcher'),
+
+    # async twins of the endpoints above, for ASGI deployments
+    path('async/upload-resume/', async_views.upload_resume),
+    path('async/analyze-resume/', async_views.analyze_resume),
+    path('async/job-matcher/', async_views.job_matcher),
+    path('async/skill-gap/', async_views.skill_gap_analyzer),
+    path('async/job-description-match/', async_views.job_description_matcher),
     
 ]
@@ -1,17 +1,61 @@
-import pdfplumber
-import docx
+import time
+
+from django.conf import settings
+
+from .extraction import extract_docx, extract_pdf
+
+
+def _source_for(file):
+    # a path lets the PDF engine fan pages out to other processes
+    if hasattr(file, "temporary_file_path"):
+        return file.temporary_file_path()
+    try:
+        return file.path
+    except (AttributeError, NotImplementedError, ValueError):
+        if hasattr(file, "open"):
+            file.open("rb")
+        return file
+
+
+def extract_resume(file, page_workers=None):
+    """
+    Extract text from an uploaded/stored resume or a plain file object.
+
+    Returns an ``ExtractionResult`` (text, pages, timed_out_pages, seconds).
+    """
+    return _extract(file.name, _source_for(file), page_workers)
+
 
 def extract_text_from_resume(file):
-    text = ""
+    return extract_resume(file).text
+
+
+def extract_resume_from_path(path):
+    # used by the extraction workers, which only get the stored file's path;
+    # passing it on as a path is what lets a long PDF's pages fan out
+    return _extract(path, path)
+
+
+def _extract(name, source, page_workers=None):
+    name = name.lower()
+    started = time.perf_counter()
 
-    if file.name.endswith(".pdf"):
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
+    if page_workers is None:
+        page_workers = getattr(settings, 'RESUME_PAGE_WORKERS', None) or 1
 
-    elif file.name.endswith(".docx"):
-        doc = docx.Document(file)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
+    if name.endswith(".pdf"):
+        result = extract_pdf(
+            source,
+            max_pages=getattr(settings, 'RESUME_MAX_PAGES', None),
+            page_timeout=getattr(settings, 'RESUME_PAGE_TIMEOUT', None),
+            workers=page_workers,
+        )
+    elif name.endswith(".docx"):
+        result = extract_docx(source)
+    else:
+        raise ValueError("Unsupported file type. Only PDF and DOCX are allowed.")
 
-    return text.strip()
+    return result._replace(
+        text=result.text.strip(),
+        seconds=time.perf_counter() - started,
+    )
@@ -1,17 +1,21 @@
 
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.core.exceptions import TooManyFilesSent
+from django.db.models import F
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework_simplejwt.tokens import RefreshToken
-from .utils import extract_text_from_resume
+from .authentication import ClaimsRefreshToken
 from .serializers import UserSerializer, ResumeSerializer
-from .models import Resume
-import pdfplumber
-import docx
-import re
+from .models import Resume, ResumeExtractionJob, current_resume_id
+from .upload_handlers import ResumeUploadHandler, UploadRejected
+from .uploads import store_files, store_upload
+from . import analysis_cache, etags, jd, scoring
+from .features import get_features
+from career_backend.db import read_replica
 
 # ------ SIGNUP ---------
 @api_view(['POST'])
@@ -38,7 +42,7 @@ def login(request):
 
     if user is not None:
         
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
 
         return Response(
             {
@@ -65,288 +69,247 @@ def login(request):
 def test_auth(request):
     return Response({"message": "Auth working"})
 
-# Utility function to extract text
-def extract_text_from_resume(file):
-    text = ""
-    file.open('rb')  # Ensure file is opened
-    try:
-        if file.name.endswith('.pdf'):
-            with pdfplumber.open(file) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-        elif file.name.endswith('.docx'):
-            doc = docx.Document(file)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-        else:
-            raise ValueError("Unsupported file type. Only PDF and DOCX are allowed.")
-    finally:
-        file.close()
-    return text
-
 # ---------- UPLOAD RESUME ----------
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser])
 def upload_resume(request):
-    serializer = ResumeSerializer(data=request.data)
+    request._request.upload_handlers = [ResumeUploadHandler(request._request)]
+    try:
+        serializer = ResumeSerializer(data=request.data)
+    except UploadRejected as exc:
+        return Response({"error": exc.detail}, status=exc.status_code)
 
     if serializer.is_valid():
-        resume = serializer.save(user=request.user)
-
-        try:
-            extracted_text = extract_text_from_resume(resume.file)
-            resume.extracted_text = extracted_text
-            resume.save()
-        except Exception as e:
-            return Response(
-                {"error": f"Text extraction failed: {str(e)}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        return Response(
-            {
-                "message": "Resume uploaded & text extracted successfully",
-                "text_length": len(extracted_text)
-            },
-            status=status.HTTP_201_CREATED
-        )
+        data, status_code = store_upload(serializer, request.user)
+        return Response(data, status=status_code)
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-
-
-@api_view(['GET'])
+# ---------- BATCH UPLOAD ----------
+@api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def analyze_resume(request):
-
-    resume = Resume.objects.filter(user=request.user).last()
-
-    if not resume:
-        return Response({"error": "No resume uploaded"}, status=404)
-
-    if not resume.extracted_text:
-        return Response({"error": "Resume text not extracted"}, status=400)
-
-
-    if resume.ats_score is not None:
-        return Response({
-            "ATS_score": resume.ats_score,
-            "message": "Already analyzed"
-        })
-    
-
-    text = resume.extracted_text.lower()
-
-    score = 0
-
-
-    # skill score------
-    skills_db = [
-        "python","django","java","spring",
-        "javascript","react","node",
-        "mongodb","sql","docker","aws"
-    ]
-
-    found_skills = [skill for skill in skills_db if skill in text]
-    skills_score = min(30, len(found_skills) * 5)
-    score += skills_score
-
-
-    # Section Check-------------
-    sections = ["education", "experience", "skills", "projects"]
-    found_sections = [sec for sec in sections if sec in text]
+@parser_classes([MultiPartParser, FormParser])
+def upload_resumes(request):
+    # any mix of PDFs, DOCX files and ZIPs of them, all under "files"
+    handler = ResumeUploadHandler(
+        request._request,
+        extensions=('.pdf', '.docx', '.zip'),
+        max_request_size=settings.RESUME_BATCH_MAX_SIZE,
+        skip_rejected=True,
+    )
+    request._request.upload_handlers = [handler]
+    try:
+        files = request.FILES.getlist('files')
+    except UploadRejected as exc:
+        return Response({"error": exc.detail}, status=exc.status_code)
+    except TooManyFilesSent:
+        return Response(
+            {"error": f"Batch is limited to {settings.DATA_UPLOAD_MAX_NUMBER_FILES} files."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    section_score = len(found_sections) * 6
-    score += section_score
+    if not files and not handler.rejected:
+        return Response(
+            {"error": "No files uploaded"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
+    results = [entry.as_dict() for entry in store_files(request.user, files)]
+    # turned away while the request was still being read
+    results += [{"file": name, "error": error} for name, error in handler.rejected]
+    created = sum(1 for result in results if "resume_id" in result)
 
-    # Contact Info-------
+    return Response(
+        {
+            "message": f"{created} of {len(results)} resume(s) uploaded",
+            "created": created,
+            "failed": len(results) - created,
+            "results": results
+        },
+        status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+    )
 
-    email_regex = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
-    phone_regex = r"\b\d{10}\b"
 
-    if re.search(email_regex, text):
-        score += 8
+# ---------- EXTRACTION JOB STATUS ----------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def extraction_job_status(request, job_id):
+    # the text itself isn't loaded, only its stored length
+    job = ResumeExtractionJob.objects.filter(
+        pk=job_id, resume__user_id=request.user.id
+    ).annotate(text_length=F('resume__extracted__length')).first()
+
+    if not job:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    data = {
+        "job_id": job.id,
+        "resume_id": job.resume_id,
+        "status": job.status,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
 
-    if re.search(phone_regex, text):
-        score += 7
+    if job.status == ResumeExtractionJob.DONE:
+        data["text_length"] = job.text_length or 0
+    elif job.status == ResumeExtractionJob.FAILED:
+        data["error"] = f"Text extraction failed: {job.error}"
 
+    return Response(data)
 
-    # Resume Length-----------
 
-    word_count = len(text.split())
 
-    if 400 <= word_count <= 1200:
-        score += 10
-    elif 250 <= word_count < 400:
-        score += 5
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@read_replica
+def analyze_resume(request):
 
-    # Action Verbs -------
+    resume = _current_resume(request.user, 'ats_score')
 
-    verbs = ["developed","built","designed","implemented","created"]
-    found_verbs = [v for v in verbs if v in text]
+    if not resume:
+        return Response({"error": "No resume uploaded"}, status=404)
 
-    if found_verbs:
-        score += 10
+    etag = etags.analysis_etag(resume)
+    unchanged = etags.not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
 
+    def compute():
+        features = get_features(resume)
+        if not features or not features.word_count:
+            return None
+        return scoring.ats_analysis(features)
 
-    final_score = min(score, 100)
+    data = analysis_cache.get_or_compute('ats', resume, compute)
 
-    resume.ats_score = final_score
-    resume.save()
+    if data is None:
+        return Response({"error": "Resume text not extracted"}, status=400)
 
+    # kept on the row for the admin list and bulk rescoring
+    if resume.ats_score != data["ATS_score"]:
+        resume.ats_score = data["ATS_score"]
+        resume.save(update_fields=['ats_score'])
 
-    return Response({
-        "ATS_score": final_score,
-        "skills_found": found_skills,
-        "sections_found": found_sections,
-        "word_count": word_count,
-        "message": "ATS analysis complete"
-    })
+    return etags.add_etag(Response(data), etag)
 
 
 # job matcher--------
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_replica
 def job_matcher(request):
-    resume = Resume.objects.filter(user=request.user).last()
+    resume = _current_resume(request.user)
+
+    data = None
+    if resume:
+        etag = etags.analysis_etag(resume)
+        unchanged = etags.not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
 
-    if not resume or not resume.extracted_text:
+        data = analysis_cache.get_or_compute(
+            'job_matcher', resume, lambda: _analyze(resume, scoring.job_matches)
+        )
+
+    if data is None:
         return Response(
             {"error": "Resume not ready"},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    text = resume.extracted_text.lower()
-
-    job_roles = {
-        "Backend Developer": ["python", "django", "sql", "api"],
-        "Frontend Developer": ["javascript", "react", "html", "css"],
-        "Full Stack Developer": ["python", "django", "react", "sql"],
-        "Java Developer": ["java", "spring", "hibernate"],
-        "DevOps Engineer": ["docker", "aws", "kubernetes"]
-    }
-
-    matches = []
-
-    for role, skills in job_roles.items():
-
-        matched_skills = [skill for skill in skills if skill in text]
-
-        score = int((len(matched_skills) / len(skills)) * 100)
-
-        if score >= 40:  
-            matches.append({
-                "role": role,
-                "match_percentage": score,
-                "matched_skills": matched_skills
-            })
-
-    # sort by highest match ------------
-    matches.sort(key=lambda x: x['match_percentage'], reverse=True)
-
-    if not matches:
-        return Response({
-            "message": "No strong job matches found. Consider adding more skills."
-        })
-
-    return Response({
-        "recommended_roles": matches,
-        "message": "Job matching completed successfully"
-    })
+    return etags.add_etag(Response(data), etag)
 
 # skill gap analyze --------
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_replica
 def skill_gap_analyzer(request):
-    resume = Resume.objects.filter(user=request.user).order_by('-uploaded_at').first()
+    resume = _current_resume(request.user)
+
+    data = None
+    if resume:
+        etag = etags.analysis_etag(resume)
+        unchanged = etags.not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
 
-    if not resume or not resume.extracted_text:
+        data = analysis_cache.get_or_compute(
+            'skill_gap', resume, lambda: _analyze(resume, scoring.skill_gap)
+        )
+
+    if data is None:
         return Response(
             {"error": "Resume not ready"},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    text = resume.extracted_text.lower()
-
-    job_roles = {
-        "Backend Developer": ["python", "django", "sql", "docker", "aws"],
-        "Frontend Developer": ["javascript", "react", "html", "css"],
-        "Full Stack Developer": ["python", "django", "react", "sql", "docker"],
-        "Java Developer": ["java", "spring", "hibernate", "microservices"],
-        "DevOps Engineer": ["docker", "aws", "kubernetes", "ci/cd"]
-    }
-
-    best_role = None
-    highest_score = 0
-    missing_skills_output = []
-
-    for role, skills in job_roles.items():
-
-        matched = [skill for skill in skills if skill in text]
-        score = len(matched)
-
-        if score > highest_score:
-            highest_score = score
-            best_role = role
-            missing_skills_output = [skill for skill in skills if skill not in text]
-
-    if not best_role:
-        return Response({
-            "message": "Could not determine a suitable role."
-        })
-
-    return Response({
-        "recommended_role": best_role,
-        "skills_you_have": highest_score,
-        "missing_skills": missing_skills_output,
-        "message": "Skill gap analysis completed"
-    })
+    return etags.add_etag(Response(data), etag)
 
 # job description ---------
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@read_replica
 def job_description_matcher(request):
-    resume = Resume.objects.filter(user=request.user).last()
-    
-    if not resume or not resume.extracted_text:
+    resume = _current_resume(request.user)
+    job_description = request.data.get('job_description', '')
+    mode = request.data.get('mode', 'weighted')
+
+    if mode not in ('weighted', 'basic'):
         return Response(
-            {"error": "Resume not ready or not uploaded"},
+            {"error": "mode must be 'weighted' or 'basic'"},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    job_description = request.data.get('job_description', '')
-    if not job_description:
+    data = None
+    if resume and job_description:
+        digest = jd.content_hash(job_description)
+
+        def compute():
+            if mode == 'weighted':
+                job_terms = jd.parse(job_description, digest)
+                return _analyze(resume, scoring.weighted_job_description_match, job_terms)
+            return _analyze(resume, scoring.job_description_match, job_description)
+
+        data = analysis_cache.get_or_compute(
+            'job_description', resume, compute, variant=f"{mode}:{digest}"
+        )
+
+    if data is not None:
+        return Response(data)
+
+    features = get_features(resume) if resume else None
+    if not features or not features.word_count:
         return Response(
-            {"error": "Job description is required"},
+            {"error": "Resume not ready or not uploaded"},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    resume_text = re.sub(r'\s+', ' ', resume.extracted_text.lower())
-    job_text = re.sub(r'\s+', ' ', job_description.lower())
+    return Response(
+        {"error": "Job description is required"},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def _current_resume(user, *fields):
+    fields = ('id', 'user', 'extracted', 'version') + fields
 
-    # extracting keyword
-    job_skills = set(re.findall(r'\b\w+\b', job_text))
-    resume_skills = set(re.findall(r'\b\w+\b', resume_text))
+    # token users don't carry the pointer, so it's read in the same query
+    resume = Resume.objects.only(*fields).filter(pk=current_resume_id(user.id)).first()
+    if resume:
+        return resume
 
-    matched_skills = list(resume_skills & job_skills)
-    missing_skills = list(job_skills - resume_skills)
+    # no pointer yet, or it was cleared by a delete: fall back to the newest upload
+    return Resume.objects.filter(user_id=user.id).only(*fields).order_by('-uploaded_at', '-pk').first()
 
-    #scoring
-    if job_skills:
-        match_score = round(len(matched_skills) / len(job_skills) * 100)
-    else:
-        match_score = 0
 
-    return Response({
-        "matched_skills": matched_skills,
-        "missing_skills": missing_skills,
-        "match_score": match_score,
-        "message": "Job description analyzed successfully"
-    })
+def _analyze(resume, score, *args):
+    features = get_features(resume)
+    if not features or not features.word_count:
+        return None
+    return score(features, *args)
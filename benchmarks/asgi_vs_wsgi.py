@@ -0,0 +1,196 @@
+"""
+Concurrent-request throughput: DRF views under gunicorn (WSGI) vs. the
+async views under uvicorn (ASGI), with the DRF views under uvicorn as a
+third row.
+
+    python benchmarks/asgi_vs_wsgi.py [--clients 64] [--seconds 10] [--workers 2]
+
+Needs gunicorn and uvicorn installed. Both servers run against the same
+throwaway SQLite database holding --users users with an extracted resume
+each; every client is one of those users and keeps a connection open,
+alternating analyze-resume/ (cached after the first call) with a
+job-description-match/ whose posting is new every time (a cache miss that
+reads the features and parses the posting).
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SETTINGS = """\
+from career_backend.settings import *
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1']
+DATABASES['default']['NAME'] = {db!r}
+DATABASES['replica']['NAME'] = {db!r}
+MEDIA_ROOT = {media!r}
+"""
+
+
+def prepare(workdir, users):
+    with open(os.path.join(workdir, 'bench_settings.py'), 'w') as fh:
+        fh.write(SETTINGS.format(
+            db=os.path.join(workdir, 'db.sqlite3'), media=os.path.join(workdir, 'media')
+        ))
+    sys.path.insert(0, workdir)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+
+    from accounts import text_cache
+    from accounts.authentication import ClaimsRefreshToken
+    from accounts.extraction import ExtractionResult
+    from accounts.models import CustomUser, Resume
+    from benchmarks.corpus import resume_lines
+
+    call_command('migrate', verbosity=0)
+
+    tokens = []
+    for number in range(users):
+        user = CustomUser.objects.create(username=f"bench{number}")
+        text = "\n".join(resume_lines(2, seed=number))
+        row = text_cache.store(f"{number:064x}", ExtractionResult(text, 2, 0))
+        resume = Resume.objects.create(user=user, file=f"resumes/bench{number}.pdf", content_hash=row.sha256)
+        resume.make_current()
+        text_cache.attach_text(resume, row)
+        tokens.append(str(ClaimsRefreshToken.for_user(user).access_token))
+    return tokens
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def client(port, prefix, token, seed, stop, timings, errors):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+    count = 0
+
+    while not stop.is_set():
+        count += 1
+        if count % 2:
+            method, path, body = 'GET', f'{prefix}analyze-resume/', None
+        else:
+            posting = f"python django docker engineer {seed} {count} with aws and sql"
+            method, path, body = 'POST', f'{prefix}job-description-match/', json.dumps(
+                {"job_description": posting}
+            )
+
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            ok = False
+
+        if ok:
+            timings.append(time.perf_counter() - started)
+        else:
+            errors.append(1)
+    conn.close()
+
+
+def run(name, command, prefix, tokens, args, env):
+    port = free_port()
+    server = subprocess.Popen(
+        [arg.format(port=port) for arg in command],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(port)
+        stop = threading.Event()
+        timings, errors = [], []
+        threads = [
+            threading.Thread(
+                target=client,
+                args=(port, prefix, tokens[i % len(tokens)], i, stop, timings, errors),
+            )
+            for i in range(args.clients)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99) - 1] if timings else 0
+    print(
+        f"{name:<28} {len(timings) / args.seconds:8.1f} req/s  "
+        f"p50 {statistics.median(timings) * 1000 if timings else 0:7.1f} ms  "
+        f"p99 {p99 * 1000:7.1f} ms  errors {len(errors)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=2, help="Server processes.")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per gunicorn worker.")
+    parser.add_argument("--users", type=int, default=64)
+    args = parser.parse_args()
+
+    for module in ('gunicorn', 'uvicorn'):
+        if shutil.which(module) is None:
+            sys.exit(f"{module} is not installed")
+
+    workdir = tempfile.mkdtemp(prefix='asgi-bench-')
+    try:
+        tokens = prepare(workdir, args.users)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([workdir, ROOT]))
+        workers = str(args.workers)
+
+        run(
+            f"gunicorn {args.workers}x{args.threads} (WSGI)",
+            ['gunicorn', 'career_backend.wsgi', '-b', '127.0.0.1:{port}',
+             '-w', workers, '--threads', str(args.threads)],
+            '/api/accounts/', tokens, args, env,
+        )
+        uvicorn = ['uvicorn', 'career_backend.asgi:application', '--port', '{port}',
+                   '--workers', workers, '--log-level', 'warning']
+        # the DRF views under ASGI separate the server from the views
+        run(f"uvicorn {args.workers}x, sync views", uvicorn, '/api/accounts/', tokens, args, env)
+        run(f"uvicorn {args.workers}x, async views", uvicorn, '/api/accounts/async/', tokens, args, env)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+The analysis endpoints' work once a resume's features exist: scoring, job
+matching, skill gap and both job description modes, for resumes of several
+lengths. Feature extraction itself is measured separately.
+"""
+import pytest
+
+from accounts import jd, scoring
+from accounts.features import compute_features
+from accounts.models import ResumeFeatures
+from benchmarks.corpus import SKILLS
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer with python, django, docker and aws "
+    "experience. You will own the data pipeline, improve latency and "
+    "throughput, and work with the platform team on ci/cd and kubernetes. "
+    + " ".join(SKILLS)
+)
+
+
+@pytest.fixture
+def features(db, text):
+    return ResumeFeatures(**compute_features(text))
+
+
+def bench_compute_features(benchmark, db, text):
+    benchmark(compute_features, text)
+
+
+def bench_analyze_resume(benchmark, features):
+    benchmark(scoring.ats_analysis, features)
+
+
+def bench_job_matcher(benchmark, features):
+    benchmark(scoring.job_matches, features)
+
+
+def bench_skill_gap_analyzer(benchmark, features):
+    benchmark(scoring.skill_gap, features)
+
+
+def bench_job_description_matcher_basic(benchmark, features):
+    benchmark(scoring.job_description_match, features, JOB_DESCRIPTION)
+
+
+def bench_job_description_matcher_weighted(benchmark, features):
+    job_terms = jd._parse(JOB_DESCRIPTION)
+    benchmark(scoring.weighted_job_description_match, features, job_terms)
+
+
+def bench_job_description_parse(benchmark, db):
+    # uncached: what the first request for a new posting pays
+    benchmark(jd._parse, JOB_DESCRIPTION)
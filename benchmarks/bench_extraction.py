@@ -0,0 +1,12 @@
+from django.core.files import File
+
+from accounts.utils import extract_text_from_resume
+
+
+def bench_extract_text_from_resume(benchmark, resume_file):
+    def extract():
+        with open(resume_file, "rb") as fh:
+            return extract_text_from_resume(File(fh, name=resume_file))
+
+    text = benchmark(extract)
+    assert "Candidate" in text
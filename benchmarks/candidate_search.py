@@ -0,0 +1,97 @@
+"""
+Recruiter search latency over a synthetic resume corpus.
+
+    python benchmarks/candidate_search.py [--sizes 10000 100000] [--queries 20]
+
+Builds the inverted index for N synthetic users in a throwaway test DB, then
+times accounts.search.rank() for a set of generated job descriptions.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from django_env import setup, test_database
+
+setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import transaction  # noqa: E402
+
+from accounts.models import Resume, SearchDocument, SearchPosting  # noqa: E402
+from accounts.search import index_terms, rank  # noqa: E402
+from benchmarks.corpus import SKILLS, resume_text, vocabulary  # noqa: E402
+
+User = get_user_model()
+BATCH = 2000
+
+
+def populate(size, words):
+    start = User.objects.count()
+    for offset in range(0, size, BATCH):
+        count = min(BATCH, size - offset)
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f"bench{start + offset + i}", email=f"bench{start + offset + i}@example.com")
+                for i in range(count)
+            ])
+            resumes = Resume.objects.bulk_create([
+                Resume(user=user, file=f"resumes/bench{user.pk}.pdf") for user in users
+            ])
+
+            documents, postings = [], []
+            for resume in resumes:
+                terms = index_terms(resume_text(words, seed=resume.pk))
+                length = sum(terms.values())
+                documents.append(SearchDocument(resume=resume, length=length))
+                postings += [
+                    SearchPosting(document_id=resume.pk, term=term, tf=tf, doc_length=length)
+                    for term, tf in terms.items()
+                ]
+            SearchDocument.objects.bulk_create(documents)
+            SearchPosting.objects.bulk_create(postings, batch_size=5000)
+
+
+def job_descriptions(words, count):
+    rng = random.Random(42)
+    return [
+        "We are hiring an engineer with " + " ".join(rng.sample(SKILLS, 4))
+        + " experience. " + " ".join(rng.sample(words[:800], 25))
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    words = vocabulary()
+    queries = job_descriptions(words, args.queries)
+
+    with test_database():
+        indexed = 0
+        for size in sorted(args.sizes):
+            started = time.perf_counter()
+            populate(size - indexed, words)
+            indexed = size
+            build = time.perf_counter() - started
+
+            timings = []
+            for query in queries:
+                started = time.perf_counter()
+                rank(query, args.limit)
+                timings.append((time.perf_counter() - started) * 1000)
+
+            timings.sort()
+            print(
+                f"{size:>7} resumes  {SearchPosting.objects.count():>9} postings  "
+                f"build {build:6.1f}s  query p50 {statistics.median(timings):7.1f} ms  "
+                f"p95 {timings[int(len(timings) * 0.95) - 1]:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import pytest
+
+from benchmarks.django_env import setup, test_database
+
+setup()
+
+from benchmarks.corpus import resume_text, vocabulary, write_resume  # noqa: E402
+
+PAGE_COUNTS = [1, 5, 20]
+WORD_COUNTS = [250, 1000, 5000]
+
+
+@pytest.fixture(scope="session")
+def db():
+    with test_database():
+        yield
+
+
+@pytest.fixture(
+    scope="session",
+    params=[(fmt, pages) for fmt in ("pdf", "docx") for pages in PAGE_COUNTS],
+    ids=lambda param: f"{param[0]}-{param[1]}p",
+)
+def resume_file(request, tmp_path_factory):
+    fmt, pages = request.param
+    path = tmp_path_factory.mktemp("resumes") / f"resume-{pages}p.{fmt}"
+    return write_resume(str(path), pages, seed=pages)
+
+
+@pytest.fixture(scope="session")
+def words():
+    return vocabulary()
+
+
+@pytest.fixture(params=WORD_COUNTS, ids=lambda n: f"{n}words")
+def text(request, words):
+    return resume_text(words, length=request.param, seed=request.param)
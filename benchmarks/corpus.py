@@ -0,0 +1,163 @@
+"""
+Synthetic resume generator for the benchmarks.
+
+PDFs are written by hand (one Helvetica text stream per page) so the
+benchmarks don't need a PDF authoring library; DOCX files use python-docx,
+which the app already needs to read them.
+
+    python benchmarks/corpus.py OUT_DIR [--count 20] [--pages 1 3] [--formats pdf docx]
+"""
+import argparse
+import os
+import random
+
+SKILLS = [
+    "python", "django", "java", "spring", "javascript", "react", "node",
+    "mongodb", "sql", "docker", "aws", "kubernetes", "html", "css",
+    "hibernate", "microservices", "api", "ci/cd",
+]
+SECTIONS = ["Education", "Experience", "Skills", "Projects"]
+VERBS = ["Developed", "Built", "Designed", "Implemented", "Created"]
+FILLER = (
+    "team product service customer platform data pipeline feature release "
+    "performance reliability migration integration dashboard report quality "
+    "stakeholder requirement delivery latency throughput storage"
+).split()
+
+LINES_PER_PAGE = 45
+
+
+def resume_lines(pages, seed=0):
+    rng = random.Random(seed)
+    lines = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com  {rng.randrange(10 ** 9, 10 ** 10)}",
+    ]
+    total = pages * LINES_PER_PAGE
+
+    while len(lines) < total:
+        lines.append(rng.choice(SECTIONS))
+        for _ in range(rng.randint(4, 8)):
+            words = [rng.choice(VERBS)]
+            words += rng.sample(FILLER, 5)
+            words.append("using")
+            words += rng.sample(SKILLS, 2)
+            lines.append(" ".join(words))
+
+    return lines[:total]
+
+
+def _escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, pages, seed=0):
+    lines = resume_lines(pages, seed)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the kids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+
+    for number in range(pages):
+        chunk = lines[number * LINES_PER_PAGE:(number + 1) * LINES_PER_PAGE]
+        stream = ["BT", "/F1 10 Tf", "12 TL", "50 770 Td"]
+        stream += [f"({_escape(line)}) '" for line in chunk]
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1")
+
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        kids.append(len(objects))
+
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for index, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % index + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref
+    )
+
+    with open(path, "wb") as fh:
+        fh.write(out)
+    return path
+
+
+def write_docx(path, pages, seed=0):
+    from docx import Document
+
+    document = Document()
+    for line in resume_lines(pages, seed):
+        if line in SECTIONS:
+            document.add_heading(line, level=2)
+        else:
+            document.add_paragraph(line)
+    document.save(path)
+    return path
+
+
+def write_resume(path, pages, seed=0):
+    if path.lower().endswith(".docx"):
+        return write_docx(path, pages, seed)
+    return write_pdf(path, pages, seed)
+
+
+def vocabulary(size=5000, seed=0):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set(SKILLS) | set(FILLER) | {verb.lower() for verb in VERBS}
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def resume_text(words, length=400, seed=0):
+    """
+    Plain resume-like text drawn from ``words`` with a Zipf-ish
+    distribution, so term frequencies look like real prose.
+    """
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    body = rng.choices(words, weights=weights, k=length)
+    body += rng.sample(SKILLS, rng.randint(2, 6))
+    return " ".join([f"candidate{seed}@example.com"] + SECTIONS + body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic resumes.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--count", type=int, default=20, help="Resumes per length and format.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--formats", nargs="+", choices=("pdf", "docx"), default=["pdf", "docx"])
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    written = 0
+    for pages in args.pages:
+        for fmt in args.formats:
+            for seed in range(args.count):
+                write_resume(os.path.join(args.out_dir, f"resume-{pages}p-{seed}.{fmt}"), pages, seed)
+                written += 1
+    print(f"Wrote {written} resume(s) to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Concurrent write throughput against SQLite: Django's default connection
+settings vs. career_backend.db.sqlite_database (WAL, synchronous=NORMAL,
+busy timeout, BEGIN IMMEDIATE, persistent connections).
+
+    python benchmarks/db_concurrency.py [--writers 8] [--readers 8] [--seconds 10]
+
+Each configuration runs in its own process against a fresh database file.
+Writer threads do what an upload does (read the user, insert the resume and
+its extraction job, move the user's current resume) in one transaction;
+reader threads fetch a user's current resume and their pending jobs. Every
+operation counts as one request, so connections are recycled the way
+CONN_MAX_AGE decides between requests.
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETTINGS = """\
+from career_backend.settings import *
+from career_backend.db import sqlite_database
+
+DATABASE_ROUTERS = []
+DATABASES = {{'default': {database}}}
+"""
+
+CONFIGS = {
+    'django-default': "{{'ENGINE': 'django.db.backends.sqlite3', 'NAME': {name!r}}}",
+    'tuned': "sqlite_database({name!r}, conn_max_age=600)",
+}
+
+USERS = 200
+
+
+def prepare():
+    from django.core.management import call_command
+
+    from accounts.models import CustomUser
+
+    call_command('migrate', verbosity=0)
+    CustomUser.objects.bulk_create([CustomUser(username=f"bench{i}") for i in range(USERS)])
+    return list(CustomUser.objects.values_list('pk', flat=True))
+
+
+def upload(user_id):
+    from django.db import transaction
+
+    from accounts.jobs import enqueue_extraction
+    from accounts.models import CustomUser, Resume
+
+    with transaction.atomic():
+        user = CustomUser.objects.only('id').get(pk=user_id)
+        resume = Resume.objects.create(user=user, file=f"resumes/bench{user_id}.pdf")
+        resume.make_current()
+        enqueue_extraction(resume)
+
+
+def read(user_id):
+    from accounts.models import CustomUser, Resume, ResumeExtractionJob
+
+    user = CustomUser.objects.only('current_resume').get(pk=user_id)
+    Resume.objects.filter(pk=user.current_resume_id).first()
+    ResumeExtractionJob.objects.filter(resume__user_id=user_id, status='PENDING').count()
+
+
+def worker(operation, user_ids, seed, stop, timings, errors):
+    from django.db import OperationalError, close_old_connections, connection
+
+    rng = random.Random(seed)
+    while not stop.is_set():
+        close_old_connections()  # request_started
+        started = time.perf_counter()
+        try:
+            operation(rng.choice(user_ids))
+            timings.append(time.perf_counter() - started)
+        except OperationalError:
+            # "database is locked"
+            errors.append(1)
+        close_old_connections()  # request_finished
+    connection.close()
+
+
+def run(args):
+    sys.path.insert(0, ROOT)
+    import django
+    django.setup()
+
+    user_ids = prepare()
+    stop = threading.Event()
+    writes, write_errors, reads, read_errors = [], [], [], []
+    threads = [
+        threading.Thread(target=worker, args=(upload, user_ids, i, stop, writes, write_errors))
+        for i in range(args.writers)
+    ] + [
+        threading.Thread(target=worker, args=(read, user_ids, -i, stop, reads, read_errors))
+        for i in range(1, args.readers + 1)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    writes.sort()
+    p99 = writes[int(len(writes) * 0.99) - 1] if writes else 0
+    print(
+        f"{args.config:<16} writes {len(writes) / args.seconds:8.1f}/s  "
+        f"p50 {statistics.median(writes) * 1000 if writes else 0:7.1f} ms  "
+        f"p99 {p99 * 1000:7.1f} ms  locked {len(write_errors):>4}  "
+        f"reads {len(reads) / args.seconds:8.1f}/s  locked {len(read_errors):>4}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--config", choices=CONFIGS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        return run(args)
+
+    for config, database in CONFIGS.items():
+        workdir = tempfile.mkdtemp(prefix='db-bench-')
+        try:
+            with open(os.path.join(workdir, 'bench_settings.py'), 'w') as fh:
+                fh.write(SETTINGS.format(
+                    database=database.format(name=os.path.join(workdir, 'db.sqlite3'))
+                ))
+            env = dict(
+                os.environ,
+                PYTHONPATH=os.pathsep.join([workdir, ROOT]),
+                DJANGO_SETTINGS_MODULE='bench_settings',
+            )
+            subprocess.run(
+                [sys.executable, __file__, '--config', config,
+                 '--writers', str(args.writers), '--readers', str(args.readers),
+                 '--seconds', str(args.seconds)],
+                env=env, check=True,
+            )
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Boot Django for a benchmark script and give it a throwaway test database.
+"""
+import os
+import sys
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup():
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'career_backend.settings')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(alias='default', keepdb=False):
+    from django.db import connections
+
+    connection = connections[alias]
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+
+    # aliases that mirror this one in tests (the read replica) follow it
+    mirrors = {}
+    for other in connections:
+        if connections[other].settings_dict.get('TEST', {}).get('MIRROR') == alias:
+            mirrors[other] = connections[other].settings_dict
+            connections[other].close()
+            connections[other].creation.set_as_test_mirror(connection.settings_dict)
+    try:
+        yield connection
+    finally:
+        for other, settings_dict in mirrors.items():
+            connections[other].close()
+            connections[other].settings_dict = settings_dict
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
@@ -0,0 +1,94 @@
+"""
+Wall-clock and peak RSS of PDF extraction: the old page loop vs. the engine.
+
+    python benchmarks/extraction.py [--pages 1 10 50] [--workers N]
+
+Every measurement runs in a fresh interpreter so peak RSS isn't polluted by
+earlier runs; for the engine the pool children's peak is reported as well.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import write_pdf  # noqa: E402
+
+
+def legacy_extract(path):
+    # the pre-engine implementation from accounts/views.py
+    import pdfplumber
+
+    text = ""
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            text += page.extract_text() or ""
+    return text
+
+
+def engine_extract(path, workers):
+    from accounts.extraction import extract_pdf
+
+    return extract_pdf(path, workers=workers).text
+
+
+def run_child(impl, path, workers):
+    started = time.perf_counter()
+    if impl == "legacy":
+        text = legacy_extract(path)
+    else:
+        text = engine_extract(path, workers)
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        "seconds": elapsed,
+        "chars": len(text),
+        # ru_maxrss is KiB on Linux
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "children_peak_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }))
+
+
+def measure(impl, path, workers):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", impl, path, "--workers", str(workers)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--child", nargs=2, metavar=("IMPL", "PATH"))
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.workers)
+        return
+
+    header = f"{'pages':>5}  {'impl':<7} {'seconds':>8} {'peak RSS MiB':>13} {'child RSS MiB':>14}"
+    print(header)
+    print("-" * len(header))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = write_pdf(os.path.join(tmp, f"resume_{pages}.pdf"), pages, seed=pages)
+            for impl in ("legacy", "engine"):
+                result = measure(impl, path, args.workers)
+                print(
+                    f"{pages:>5}  {impl:<7} {result['seconds']:>8.3f} "
+                    f"{result['peak_rss_kb'] / 1024:>13.1f} "
+                    f"{result['children_peak_rss_kb'] / 1024:>14.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Per-request cost of authentication on a hot read endpoint.
+
+    python benchmarks/jwt_auth.py [--users 100] [--requests 2000]
+
+Times GET analyze-resume/ (answered from the analysis cache) through the
+Django test client in a throwaway test DB, three ways: simplejwt's plain
+access token with the user loaded on every request, the same token with the
+per-process user cache (what the admin endpoints use), and the default, a
+token carrying the role claims (no user lookup at all).
+"""
+import argparse
+import statistics
+import time
+from unittest import mock
+
+from django_env import setup, test_database
+
+setup()
+
+from django.db import connections  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from accounts import text_cache  # noqa: E402
+from accounts.authentication import CachedUserJWTAuthentication, ClaimsRefreshToken  # noqa: E402
+from accounts.extraction import ExtractionResult  # noqa: E402
+from accounts.models import CustomUser, Resume  # noqa: E402
+from accounts.views import analyze_resume  # noqa: E402
+from benchmarks.corpus import resume_lines  # noqa: E402
+
+PATH = '/api/accounts/analyze-resume/'
+
+
+def populate(users):
+    created = []
+    for number in range(users):
+        user = CustomUser.objects.create(username=f"bench{number}")
+        text = "\n".join(resume_lines(2, seed=number))
+        row = text_cache.store(f"{number:064x}", ExtractionResult(text, 2, 0))
+        resume = Resume.objects.create(user=user, file=f"resumes/bench{number}.pdf", content_hash=row.sha256)
+        resume.make_current()
+        text_cache.attach_text(resume, row)
+        created.append(user)
+    return created
+
+
+def measure(name, clients, requests):
+    for client in clients:
+        # warm the analysis cache (and the user cache, where there is one)
+        client.get(PATH)
+
+    timings = []
+    with CaptureQueriesContext(connections['default']) as default, \
+            CaptureQueriesContext(connections['replica']) as replica:
+        for number in range(requests):
+            started = time.perf_counter()
+            response = clients[number % len(clients)].get(PATH)
+            timings.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.status_code
+
+    timings.sort()
+    queries = (len(default) + len(replica)) / requests
+    print(
+        f"{name:<26} {queries:5.2f} queries/request  "
+        f"p50 {statistics.median(timings) * 1000:6.2f} ms  "
+        f"p99 {timings[int(len(timings) * 0.99) - 1] * 1000:6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_test_environment()  # allows the test client's host
+    with test_database():
+        users = populate(args.users)
+        plain = [Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}") for user in users]
+        claims = [
+            Client(HTTP_AUTHORIZATION=f"Bearer {ClaimsRefreshToken.for_user(user).access_token}")
+            for user in users
+        ]
+
+        with mock.patch.object(
+            analyze_resume.cls, 'authentication_classes', [CachedUserJWTAuthentication]
+        ):
+            with override_settings(AUTH_USER_CACHE_TTL=0):
+                measure("user query per request", plain, args.requests)
+            measure("cached user", plain, args.requests)
+        measure("role claims", claims, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'career_backend.settings')
+# persistent connections leak from sync_to_async's executor threads
+os.environ.setdefault('DJANGO_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,98 @@
+"""
+Database configuration: tuned SQLite connections and read routing.
+
+``sqlite_database`` builds a ``DATABASES`` entry that opens every connection
+in WAL mode (readers no longer block the writer or each other) with
+``synchronous=NORMAL`` (no fsync per commit, still safe in WAL mode), waits
+on a locked database instead of failing with "database is locked", and
+starts write transactions with ``BEGIN IMMEDIATE`` so two of them can't
+deadlock upgrading their locks. Connections are kept for ``conn_max_age``
+seconds; pass 0 for ASGI deployments, where Django doesn't reuse them safely
+(the settings take it from ``DJANGO_CONN_MAX_AGE``, which asgi.py sets to 0).
+
+``ReplicaRouter`` sends reads made inside a ``read_replica`` view to the
+``replica`` alias when one is configured. For SQLite that is a second,
+query-only connection to the same file; pointed at a real replica the
+decorated views have to tolerate replication lag, which is why only the
+analysis and admin read endpoints use it.
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def sqlite_database(name, *, read_only=False, timeout=20, conn_max_age=0):
+    """
+    A ``DATABASES`` entry for the SQLite file ``name``. ``timeout`` is how
+    many seconds a connection waits for a lock (SQLite's busy timeout).
+    """
+    pragmas = ['PRAGMA journal_mode=WAL', 'PRAGMA synchronous=NORMAL']
+    options = {'timeout': timeout}
+    if read_only:
+        pragmas.append('PRAGMA query_only=ON')
+    else:
+        options['transaction_mode'] = 'IMMEDIATE'
+    options['init_command'] = ';'.join(pragmas)
+
+    database = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'OPTIONS': options,
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': conn_max_age != 0,
+    }
+    if read_only:
+        # tests run against the default database only
+        database['TEST'] = {'MIRROR': DEFAULT_DB_ALIAS}
+    return database
+
+
+def read_replica(view):
+    """Run ``view`` (sync or async) with its reads routed to the replica."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            token = _replica_reads.set(True)
+            try:
+                return await view(*args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+    else:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            token = _replica_reads.set(True)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or REPLICA not in settings.DATABASES:
+            return None
+        # a transaction has to see its own writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        # explicitly, or rows read from the replica would be saved back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
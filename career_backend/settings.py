@@ -10,7 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
+
+from .db import sqlite_database
+
 # from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'accounts.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,12 +81,18 @@ WSGI_APPLICATION = 'career_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# WAL mode, busy timeout and IMMEDIATE write transactions; the analysis and
+# admin read endpoints read from 'replica' (see career_backend/db.py). Point
+# both at the same file when overriding NAME.
+# Connections persist for DJANGO_CONN_MAX_AGE seconds. asgi.py defaults it to
+# 0: under ASGI, sync code runs in executor threads that never close theirs.
+CONN_MAX_AGE = int(os.environ.get('DJANGO_CONN_MAX_AGE', 600))
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3', conn_max_age=CONN_MAX_AGE),
+    'replica': sqlite_database(BASE_DIR / 'db.sqlite3', read_only=True, conn_max_age=CONN_MAX_AGE),
 }
+DATABASE_ROUTERS = ['career_backend.db.ReplicaRouter']
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
 ]
@@ -130,7 +141,7 @@ from datetime import timedelta
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -143,8 +154,56 @@ SIMPLE_JWT = {
 
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+
+    # access tokens carry role/is_staff, so requests don't load the user
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.ClaimsTokenRefreshSerializer',
+    'TOKEN_USER_CLASS': 'accounts.authentication.ClaimsUser',
 }
+# full users for views using CachedUserJWTAuthentication (the admin endpoints), cached per process
+AUTH_USER_CACHE_TTL = 30
+AUTH_USER_CACHE_SIZE = 1024
+
+# Rotated refresh tokens are revoked in accounts.RevokedToken, checked
+# through a per-process Bloom filter (see accounts/revocation.py)
+JWT_REVOCATION_CAPACITY = 1_000_000  # the filter grows past this if needed
+JWT_REVOCATION_ERROR_RATE = 0.001  # share of live tokens that still cost a query
+JWT_REVOCATION_SYNC_INTERVAL = 5  # seconds
+JWT_REVOCATION_REBUILD_INTERVAL = 60 * 60  # seconds; also purges expired rows
+
+# Skills and job roles are edited in the admin; each process picks up a
+# change within this many seconds (see accounts/taxonomy.py)
+TAXONOMY_CHECK_INTERVAL = 5
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
-
+# Resume text extraction runs out of band: `python manage.py run_extraction_workers`
+EXTRACTION_WORKERS = None  # defaults to os.cpu_count()
+# processes each extraction worker spreads a long PDF's pages over, so up to
+# EXTRACTION_WORKERS x RESUME_PAGE_WORKERS in all; 1 parses pages in the worker
+RESUME_PAGE_WORKERS = 1
+RESUME_MAX_PAGES = 50
+RESUME_PAGE_TIMEOUT = 10  # seconds; only enforced where SIGALRM is available
+RESUME_MAX_FILE_SIZE = 10 * 1024 * 1024  # bytes, per resume
+RESUME_BATCH_MAX_FILES = 500  # per upload-resumes/ request, ZIP members included
+# Django's own cap on multipart files (100 by default) would turn a batch
+# away before RESUME_BATCH_MAX_FILES is applied
+DATA_UPLOAD_MAX_NUMBER_FILES = RESUME_BATCH_MAX_FILES
+RESUME_BATCH_MAX_SIZE = 200 * 1024 * 1024  # bytes, whole upload-resumes/ request
+
+# Analysis payloads are cached per (endpoint, resume, scoring.RULESET_VERSION)
+ANALYSIS_CACHE_TIMEOUT = 24 * 60 * 60
+ANALYSIS_CACHE_LRU_SIZE = 1024
+
+# Parsed, IDF-weighted job descriptions are shared across users by content hash
+JD_CACHE_TIMEOUT = 10 * 60
+JD_CACHE_LRU_SIZE = 256
+
+# admin/analytics/ serves a snapshot this many seconds old at most
+ADMIN_ANALYTICS_CACHE_TTL = 60
+
+# Per-endpoint metrics, served to admins at /metrics (see accounts/metrics.py)
+METRICS_ENABLED = True
+METRICS_PROFILE_SAMPLE_RATE = 0.0  # share of requests run under cProfile, e.g. 0.001
+METRICS_PROFILE_DIR = BASE_DIR / 'profiles'